@@ -22,4 +22,19 @@
 from .online_core import OnlineCore
 from .online_scrapping import OnlineScrapping
 from .online_signalr import OnlineSignalR
-from .online import Online
\ No newline at end of file
+from .online import Online
+from .tick_store import TickStore
+from .history_cache import HistoryCache
+from .history_bulk import HistoryBulk, RateLimiter
+from .order_book import OrderBook, OrderBooks
+from .online_dispatcher import OnlineDispatcher
+from .quote_table import QuoteTable, QuoteSnapshot
+from .online_stream import OnlineStream, OpenEvent, SecuritiesEvent, OptionsEvent, ReposEvent, OrderBookEvent, PersonalPortfolioEvent, ErrorEvent, CloseEvent
+from .online_reconnect import OnlineReconnector
+from .signalr_replay import SignalRRecorder, SignalRReplayer
+from .quote_records import Quote, quote_dtype, process_quotes_records, records_to_quotes, records_to_frame
+from .options_chain import OptionsChain, black_scholes, implied_volatility
+from .repo_curve import RepoCurves, RepoCurve
+from .order_pipeline import OrderPipeline, OrderRequest, OrderResult
+from .order_tracker import OrderTracker
+from .holdings import Holdings
@@ -0,0 +1,22 @@
+import sys
+import statistics
+import subprocess
+
+time_code = 'import time; t = time.perf_counter(); import {0}; print(time.perf_counter() - t)'
+memory_code = 'import tracemalloc; tracemalloc.start(); import {0}; print(tracemalloc.get_traced_memory()[1])'
+
+def measure(code, repeat):
+    return statistics.median(float(subprocess.check_output([sys.executable, '-c', code])) for _ in range(repeat))
+
+def benchmark():
+
+    print('{:>12} {:>12} {:>14} {:>22}'.format('module', 'import (ms)', 'peak (MB)', 'modules loaded'))
+    for module in ['shda', 'shda_async']:
+        import_time = measure(time_code.format(module), 9)
+        peak_memory = measure(memory_code.format(module), 3)
+        loaded = subprocess.check_output([sys.executable, '-c', 'import sys, {0}; print(",".join(m for m in ("pandas", "numpy", "pyquery") if m in sys.modules) or "-")'.format(module)]).decode().strip()
+
+        print('{:>12} {:>12.1f} {:>14.1f} {:>22}'.format(module, import_time * 1000, peak_memory / 1e6, loaded))
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,42 @@
+import timeit
+import random
+import numpy as np
+import pandas as pd
+from numeric_conversion import convert_to_numeric_columns
+
+numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
+
+def locale_number(value):
+    return '{:,.2f}'.format(value).replace(',', 'X').replace('.', ',').replace('X', '.')
+
+def make_frame(size):
+    random.seed(size)
+    data = {}
+    for i, column in enumerate(numeric_columns):
+        if i % 3 == 0:
+            data[column] = [random.uniform(0, 1000) for _ in range(size)]
+        else:
+            data[column] = [locale_number(random.uniform(0, 100000)) if random.random() > 0.05 else '-' for _ in range(size)]
+
+    return pd.DataFrame(data)
+
+def convert_per_column(df, columns):
+    for col in columns:
+        df[col] = df[col].apply(lambda x: x.replace('.', '').replace(',', '.') if isinstance(x, str) else x)
+        df[col] = pd.to_numeric(df[col].apply(lambda x: np.nan if x == '-' else x))
+    return df
+
+def benchmark():
+
+    print('{:>8} {:>18} {:>16} {:>9}'.format('rows', 'per column (ms)', 'batched (ms)', 'speedup'))
+    for size in [1000, 10000, 100000]:
+        df = make_frame(size)
+        number = max(1, 20000 // size)
+
+        per_column_time = min(timeit.repeat(lambda: convert_per_column(df.copy(), numeric_columns), number=number, repeat=3)) / number
+        batched_time = min(timeit.repeat(lambda: convert_to_numeric_columns(df.copy(), numeric_columns), number=number, repeat=3)) / number
+
+        print('{:>8} {:>18.2f} {:>16.2f} {:>8.1f}x'.format(size, per_column_time * 1000, batched_time * 1000, per_column_time / batched_time))
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,193 @@
+import time
+import queue
+import random
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+from common import brokers
+from numeric_conversion import convert_to_numeric_columns
+from shda_core import SHDACore
+from quote_records import process_quotes_records
+
+securities_filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
+securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
+options_filter_columns = securities_filter_columns[:-1] + ['MaturityDate', 'StrikePrice', 'OptionType', 'UnderlyingAsset']
+options_columns = securities_columns[:-1] + ['expiration', 'strike', 'kind', 'underlying_asset']
+repos_filter_columns = ['Symbol', 'Days', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'ClosePrice']
+repos_columns = ['symbol', 'days', 'settlement', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'close']
+portfolio_filter_columns = options_filter_columns + ['ClosePrice']
+portfolio_columns = options_columns + ['close']
+
+numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
+options_numeric_columns = numeric_columns + ['strike']
+repos_numeric_columns = ['days', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'close']
+portfolio_numeric_columns = options_numeric_columns + ['close']
+settlements = {'1': 'spot', '2': '24hs', '3': '48hs'}
+
+# Rows per message and messages per second at the peak of a ByMA session
+peaks = {
+    'securities': (200, 20),
+    'options': (1500, 5),
+    'repos': (20, 10),
+    'order_book': (1, 400),
+    'personal_portfolio': (30, 5)}
+
+def locale_number(value):
+    return '{:,.2f}'.format(value).replace(',', 'X').replace('.', ',').replace('X', '.')
+
+def make_quote(i):
+    price = random.uniform(10, 5000)
+    return {
+        'Symbol': 'SYM{}'.format(i), 'Term': '3',
+        'BuyQuantity': random.randint(1, 10000), 'BuyPrice': locale_number(price * 0.99),
+        'SellPrice': locale_number(price * 1.01), 'SellQuantity': random.randint(1, 10000),
+        'LastPrice': locale_number(price), 'VariationRate': locale_number(random.uniform(-5, 5)),
+        'StartPrice': price, 'MaxPrice': price * 1.02, 'MinPrice': price * 0.98, 'PreviousClose': price,
+        'TotalAmountTraded': locale_number(price * 1000), 'TotalQuantityTraded': random.randint(1, 100000),
+        'Trades': random.randint(1, 500) if i % 10 else '-', 'TradeDate': '20250117',
+        'Hour': '{:02d}:{:02d}:{:02d}'.format(11 + i % 6, i % 60, (i * 7) % 60), 'Panel': 'accionesLideres'}
+
+def make_option(i):
+    quote = make_quote(i)
+    quote.update({'MaturityDate': '20250221', 'StrikePrice': locale_number(500 + 20 * (i % 50)), 'OptionType': 1 + i % 2, 'UnderlyingAsset': 'GGAL'})
+    return quote
+
+def make_repo(i):
+    quote = make_quote(i)
+    quote.update({'Symbol': 'PESOS', 'Days': 1 + i, 'Term': '1', 'ClosePrice': locale_number(random.uniform(20, 40))})
+    return quote
+
+def make_portfolio(i):
+    quote = make_option(i)
+    quote['ClosePrice'] = quote['PreviousClose']
+    return quote
+
+def make_order_book(i):
+    price = random.uniform(10, 5000)
+    return {
+        'Symbol': 'SYM{}'.format(i), 'Term': '3',
+        'BuyPositions': [{'Price': price * (1 - 0.001 * level), 'Quantity': random.randint(1, 10000)} for level in range(5)],
+        'SellPositions': [{'Price': price * (1 + 0.001 * level), 'Quantity': random.randint(1, 10000)} for level in range(5)]}
+
+generators = {
+    'securities': make_quote,
+    'options': make_option,
+    'repos': make_repo,
+    'order_book': make_order_book,
+    'personal_portfolio': make_portfolio}
+
+def make_message(board, rows):
+    return {'M': [{'H': 'stockpriceshub', 'M': 'broadcast', 'A': [[generators[board](i) for i in range(rows)]]}]}
+
+# The online module is not part of this tree, so the DataFrame path mirrors its pipeline.  The panel
+# and records paths run the library code (SHDACore.process_panel and quote_records.process_quotes_records).
+def parse_quotes(data, filter_columns, columns, numeric):
+    df = pd.DataFrame(data)
+    df['TradeDate'] = pd.to_datetime(df['TradeDate'], format='%Y%m%d', errors='coerce') + pd.to_timedelta(df['Hour'], errors='coerce')
+    df = df[filter_columns]
+    df.columns = columns
+    df = convert_to_numeric_columns(df, numeric)
+    df['settlement'] = df['settlement'].map(settlements)
+    return df.set_index(['symbol', 'settlement'])
+
+def parse_order_book(data):
+    book = data[0]
+    size = max(len(book['BuyPositions']), len(book['SellPositions']))
+    bids = book['BuyPositions'] + [{'Price': np.nan, 'Quantity': np.nan}] * (size - len(book['BuyPositions']))
+    asks = book['SellPositions'] + [{'Price': np.nan, 'Quantity': np.nan}] * (size - len(book['SellPositions']))
+    return pd.DataFrame({
+        'symbol': book['Symbol'], 'settlement': settlements[book['Term']], 'position': np.arange(1, size + 1),
+        'bid_size': [level['Quantity'] for level in bids], 'bid': [level['Price'] for level in bids],
+        'ask': [level['Price'] for level in asks], 'ask_size': [level['Quantity'] for level in asks]}).set_index(['symbol', 'settlement'])
+
+def get_parsers(core):
+    return {
+        'securities': {
+            'frame': lambda data: parse_quotes(data, securities_filter_columns, securities_columns, numeric_columns),
+            'panel': lambda data: core.process_panel({'Result': {'Stocks': data}}, '48hs'),
+            'records': process_quotes_records},
+        'options': {
+            'frame': lambda data: parse_quotes(data, options_filter_columns, options_columns, options_numeric_columns),
+            'records': process_quotes_records},
+        'repos': {
+            'frame': lambda data: parse_quotes(data, repos_filter_columns, repos_columns, repos_numeric_columns)},
+        'order_book': {
+            'frame': parse_order_book},
+        'personal_portfolio': {
+            'frame': lambda data: parse_quotes(data, portfolio_filter_columns, portfolio_columns, portfolio_numeric_columns),
+            'records': process_quotes_records}}
+
+def measure_parse(parser, frames):
+    parse_times = np.empty(len(frames))
+
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        parser(frame['M'][0]['A'][0])
+        parse_times[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    parser(frames[0]['M'][0]['A'][0])
+    _, peak = tracemalloc.get_traced_memory()
+    allocations = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename') if stat.count_diff > 0)
+    tracemalloc.stop()
+
+    return parse_times, peak, allocations
+
+def measure_delivery(parser, frames, rate):
+    # The frames arrive at the session peak rate on the receiving thread (as on the SignalR thread), are
+    # parsed there and handed to a consumer thread that calls the callback.  The latency goes from the
+    # frame arrival to the callback, so it includes the parse cost and the time queued behind other messages.
+    messages = queue.Queue()
+    latencies = []
+
+    def on_message(received, quotes):
+        latencies.append(time.perf_counter() - received)
+
+    def consume():
+        while True:
+            message = messages.get()
+            if message is None:
+                return
+
+            on_message(*message)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        arrival = start + i / rate
+        while time.perf_counter() < arrival:
+            time.sleep(min(0.001, max(0.0, arrival - time.perf_counter())))
+
+        received = time.perf_counter()
+        messages.put((received, parser(frame['M'][0]['A'][0])))
+
+    messages.put(None)
+    consumer.join()
+
+    return np.array(latencies)
+
+def benchmark():
+
+    random.seed(0)
+    parsers = get_parsers(SHDACore(brokers[0]['broker_id']))
+
+    print('{:>20} {:>8} {:>6} {:>12} {:>12} {:>12} {:>12} {:>12} {:>12} {:>10}'.format('board', 'path', 'rows', 'msg (ms)', 'row (us)', 'msgs/sec', 'p50 (ms)', 'p99 (ms)', 'peak (KB)', 'allocs'))
+    for board, (rows, peak_rate) in peaks.items():
+        frames = [make_message(board, rows) for _ in range(max(20, 2000 // rows))]
+
+        for path, parser in parsers[board].items():
+            parse_times, peak, allocations = measure_parse(parser, frames)
+            latencies = measure_delivery(parser, frames[:max(10, peak_rate)], peak_rate)
+            cost = np.median(parse_times)
+
+            print('{:>20} {:>8} {:>6} {:>12.3f} {:>12.2f} {:>12.0f} {:>12.3f} {:>12.3f} {:>12.1f} {:>10}{}'.format(
+                board, path, rows, cost * 1000, cost / rows * 1e6, 1 / cost,
+                np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000,
+                peak / 1024, allocations, '' if 1 / cost >= peak_rate else '  < session peak ({}/sec)'.format(peak_rate)))
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,58 @@
+import timeit
+import random
+import pandas as pd
+from common import brokers, convert_to_numeric_columns
+from shda_core import SHDACore
+
+filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
+securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
+numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
+boards = {0: '', 'accionesLideres': 'bluechips', 'panelGeneral': 'general_board', 'cedears': 'cedears', 'rentaFija': 'government_bonds', 'letes': 'short_term_government_bonds', 'obligaciones': 'corporate_bonds'}
+
+def locale_number(value):
+    return '{:,.2f}'.format(value).replace(',', 'X').replace('.', ',').replace('X', '.')
+
+def make_panel(size):
+    stocks = []
+    for i in range(size):
+        price = random.uniform(10, 5000)
+        stocks.append({
+            'Symbol': 'SYM{}'.format(i), 'Term': '3',
+            'BuyQuantity': random.randint(1, 10000), 'BuyPrice': locale_number(price * 0.99),
+            'SellPrice': locale_number(price * 1.01), 'SellQuantity': random.randint(1, 10000),
+            'LastPrice': locale_number(price), 'VariationRate': locale_number(random.uniform(-5, 5)),
+            'StartPrice': price, 'MaxPrice': price * 1.02, 'MinPrice': price * 0.98, 'PreviousClose': price,
+            'TotalAmountTraded': locale_number(price * 1000), 'TotalQuantityTraded': random.randint(1, 100000),
+            'Trades': random.randint(1, 500) if i % 10 else '-', 'TradeDate': '20250117',
+            'Hour': '{:02d}:{:02d}:{:02d}'.format(11 + i % 6, i % 60, (i * 7) % 60), 'Panel': 'accionesLideres'})
+
+    return {'Result': {'Stocks': stocks}}
+
+def pandas_path(data, settlement):
+    df = pd.DataFrame(data['Result']['Stocks'])
+    df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
+    df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
+    df = df[filter_columns].copy()
+    df.columns = securities_columns
+    df = convert_to_numeric_columns(df, numeric_columns)
+    df.group = df.group.apply(lambda x: boards[x] if x in boards else boards[0])
+    df.settlement = settlement
+    return df
+
+def benchmark():
+
+    core = SHDACore(brokers[0]['broker_id'])
+
+    print('{:>8} {:>14} {:>14} {:>14} {:>9}'.format('rows', 'pandas (ms)', 'arrays (ms)', 'frame (ms)', 'speedup'))
+    for size in [50, 200, 1000, 5000]:
+        data = make_panel(size)
+        number = max(1, 2000 // size)
+
+        pandas_time = min(timeit.repeat(lambda: pandas_path(data, '48hs'), number=number, repeat=5)) / number
+        arrays_time = min(timeit.repeat(lambda: core.process_panel_arrays(data, '48hs'), number=number, repeat=5)) / number
+        frame_time = min(timeit.repeat(lambda: core.process_panel(data, '48hs'), number=number, repeat=5)) / number
+
+        print('{:>8} {:>14.3f} {:>14.3f} {:>14.3f} {:>8.1f}x'.format(size, pandas_time * 1000, arrays_time * 1000, frame_time * 1000, pandas_time / arrays_time))
+
+if __name__ == '__main__':
+    benchmark()
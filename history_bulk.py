@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import random
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class RateLimiter:
+
+    __limiters = {}
+    __limiters_lock = threading.Lock()
+
+    def __init__(self, requests_per_second):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        requests_per_second : float
+            Maximum number of requests per second.  Short bursts up to one second of budget are allowed.
+        """
+
+        self.__rate = float(requests_per_second)
+        self.__capacity = max(1.0, self.__rate)
+        self.__tokens = self.__capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_broker_limiter(cls, broker, requests_per_second):
+        """
+        Return the rate limiter shared by all the downloads of a broker.
+
+        Parameters
+        ----------
+        broker : int
+            Broker ByMA id.
+        requests_per_second : float
+            Budget used when the limiter of the broker is created.
+        """
+
+        with cls.__limiters_lock:
+            if broker not in cls.__limiters:
+                cls.__limiters[broker] = cls(requests_per_second)
+
+            return cls.__limiters[broker]
+
+    def acquire(self):
+        """
+        Wait until a request can be sent without exceeding the budget.
+        """
+
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate)
+                self.__updated = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                wait = (1 - self.__tokens) / self.__rate
+
+            time.sleep(wait)
+
+class HistoryBulk:
+
+    def __init__(self, history, broker, requests_per_second=5, max_workers=8, retries=3, backoff=1.0):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        history : object
+            History module of an authenticated client (hb.history).
+        broker : int
+            Broker ByMA id.  The requests per second budget is shared by all the instances of the same broker.
+        requests_per_second : float, optional
+            Maximum number of requests per second sent to the broker.  Default: 5.
+        max_workers : int, optional
+            Maximum number of concurrent requests.  Default: 8.
+        retries : int, optional
+            Number of times a failed request is retried.  Default: 3.
+        backoff : float, optional
+            Seconds to wait before the first retry.  The wait is doubled (plus jitter) on each retry.  Default: 1.
+        """
+
+        self.__history = history
+        self.__limiter = RateLimiter.get_broker_limiter(broker, requests_per_second)
+        self.__max_workers = max_workers
+        self.__retries = retries
+        self.__backoff = backoff
+
+    def get_daily_history_bulk(self, symbols, from_date, to_date, raise_exception=False):
+        """
+        Download the daily history of several symbols and return it in a single long format DataFrame.
+
+        Parameters
+        ----------
+        symbols : list of str
+            Symbols to download.
+        from_date : datetime.date
+            First date of the range.
+        to_date : datetime.date
+            Last date of the range.
+        raise_exception : bool, optional
+            Raise the error of a symbol that could not be downloaded after all the retries.  Default: False (the symbol is skipped).
+        """
+
+        return self.__concat(self.iter_daily_history(symbols, from_date, to_date, raise_exception))
+
+    def iter_daily_history(self, symbols, from_date, to_date, raise_exception=False):
+        """
+        Download the daily history of several symbols, yielding (symbol, DataFrame) as each download completes.
+
+        The DataFrame is None when the symbol could not be downloaded and raise_exception is False.
+        """
+
+        return self.__iter(self.__history.get_daily_history, [(symbol, from_date, to_date) for symbol in symbols], raise_exception)
+
+    def get_intraday_history_bulk(self, symbols, raise_exception=False):
+        """
+        Download the intraday history of several symbols and return it in a single long format DataFrame.
+
+        Parameters
+        ----------
+        symbols : list of str
+            Symbols to download.
+        raise_exception : bool, optional
+            Raise the error of a symbol that could not be downloaded after all the retries.  Default: False (the symbol is skipped).
+        """
+
+        return self.__concat(self.iter_intraday_history(symbols, raise_exception))
+
+    def iter_intraday_history(self, symbols, raise_exception=False):
+        """
+        Download the intraday history of several symbols, yielding (symbol, DataFrame) as each download completes.
+
+        The DataFrame is None when the symbol could not be downloaded and raise_exception is False.
+        """
+
+        return self.__iter(self.__history.get_intraday_history, [(symbol,) for symbol in symbols], raise_exception)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __iter(self, download, requests_args, raise_exception):
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = {executor.submit(self.__download, download, args): args[0] for args in requests_args}
+
+            try:
+                for future in as_completed(futures):
+                    try:
+                        yield futures[future], future.result()
+                    except Exception:
+                        if raise_exception:
+                            raise
+
+                        yield futures[future], None
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def __download(self, download, args):
+
+        for retry in range(self.__retries + 1):
+            self.__limiter.acquire()
+            try:
+                return download(*args)
+            except Exception:
+                if retry == self.__retries:
+                    raise
+
+                time.sleep(self.__backoff * (2 ** retry) * (1 + random.random()))
+
+    def __concat(self, results):
+
+        dfs = [df.assign(symbol=symbol) for symbol, df in results if df is not None and not df.empty]
+        if not dfs:
+            return pd.DataFrame(columns=['symbol'])
+
+        df = pd.concat(dfs, ignore_index=True)
+        return df[['symbol'] + [column for column in df.columns if column != 'symbol']]
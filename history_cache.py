@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+
+class HistoryCache:
+
+    __history_columns = ['date', 'open', 'high', 'low', 'close', 'volume']
+    __record_dtype = np.dtype([('date', '<i4'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'), ('volume', '<f8')])
+
+    __epoch = datetime.date(1970, 1, 1)
+
+    def __init__(self, folder, get_daily_history):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        folder : str
+            Folder where the daily history of each symbol is saved.
+        get_daily_history : function(symbol, from_date, to_date)
+            Function used to download the missing ranges (usually hb.history.get_daily_history).
+            It must return a DataFrame with the columns date, open, high, low, close and volume.
+        """
+
+        self.__folder = folder
+        self.__get_daily_history = get_daily_history
+        self.__records = {}
+        self.__symbol_locks = {}
+        self.__lock = threading.Lock()
+
+        os.makedirs(folder, exist_ok=True)
+
+    def get_daily_history(self, symbol, from_date, to_date, as_frame=True):
+        """
+        Return the daily history of a symbol, downloading only the dates that are not in the cache.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol of the security.
+        from_date : datetime.date or str
+            First date of the range (inclusive).
+        to_date : datetime.date or str
+            Last date of the range (inclusive).
+        as_frame : bool, optional
+            When False, a read-only NumPy structured array (a slice of the memory-mapped file) is returned
+            instead of a DataFrame.  The date field is the number of days since 1970-01-01.  Default: True.
+        """
+
+        first = self.__to_days(from_date)
+        last = self.__to_days(to_date)
+
+        # Each symbol is downloaded under its own lock, so the downloads of different symbols run concurrently
+        with self.__get_symbol_lock(symbol):
+            self.__update(symbol, first, last)
+            records = self.__get_records(symbol)
+
+        start = np.searchsorted(records['date'], first, side='left')
+        end = np.searchsorted(records['date'], last, side='right')
+        records = records[start:end]
+
+        if not as_frame:
+            return records
+
+        df = pd.DataFrame({column: records[column] for column in self.__history_columns})
+        df['date'] = pd.to_datetime(df['date'].astype('int64'), unit='D')
+        return df
+
+    def clear(self, symbol=None):
+        """
+        Remove the cached history of a symbol, or of all the symbols if none is specified.
+        """
+
+        symbols = [symbol] if symbol else [filename[:-len('.ohlcv')] for filename in os.listdir(self.__folder) if filename.endswith('.ohlcv')]
+        for symbol in symbols:
+            with self.__get_symbol_lock(symbol):
+                self.__records.pop(symbol, None)
+                for filename in [self.__get_data_filename(symbol), self.__get_ranges_filename(symbol)]:
+                    if os.path.exists(filename):
+                        os.remove(filename)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_symbol_lock(self, symbol):
+
+        with self.__lock:
+            lock = self.__symbol_locks.get(symbol)
+            if lock is None:
+                lock = self.__symbol_locks[symbol] = threading.Lock()
+
+            return lock
+
+    def __update(self, symbol, first, last):
+
+        ranges = self.__load_ranges(symbol)
+        missing = self.__get_missing_ranges(ranges, first, last)
+        if not missing:
+            return
+
+        dfs = [self.__get_daily_history(symbol, self.__to_date(start), self.__to_date(end)) for start, end in missing]
+        new_records = np.concatenate([self.__to_records(df) for df in dfs if df is not None and not df.empty] or [np.empty(0, dtype=self.__record_dtype)])
+
+        if len(new_records):
+            self.__save_records(symbol, new_records)
+
+        # The current day is never marked as downloaded because its bar is not closed yet
+        today = self.__to_days(datetime.date.today())
+        for start, end in missing:
+            end = min(end, today - 1)
+            if start <= end:
+                ranges.append([start, end])
+
+        self.__save_ranges(symbol, self.__merge_ranges(ranges))
+
+    def __get_missing_ranges(self, ranges, first, last):
+
+        missing = []
+        current = first
+        for start, end in ranges:
+            if end < current:
+                continue
+            if start > last:
+                break
+            if start > current:
+                missing.append((current, start - 1))
+            current = max(current, end + 1)
+
+        if current <= last:
+            missing.append((current, last))
+
+        return missing
+
+    def __merge_ranges(self, ranges):
+
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        return merged
+
+    def __to_records(self, df):
+
+        records = np.empty(len(df), dtype=self.__record_dtype)
+        records['date'] = (pd.to_datetime(df['date']).dt.normalize().to_numpy(dtype='datetime64[D]').astype(np.int64))
+        for column in self.__history_columns[1:]:
+            records[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+
+        return records
+
+    def __save_records(self, symbol, new_records):
+
+        records = np.concatenate([np.asarray(self.__get_records(symbol)), new_records])
+
+        # Keep the last downloaded bar of each date
+        records = records[::-1]
+        _, index = np.unique(records['date'], return_index=True)
+        records = records[index]
+
+        filename = self.__get_data_filename(symbol)
+        self.__records.pop(symbol, None)
+        records.tofile(filename + '.tmp')
+        os.replace(filename + '.tmp', filename)
+
+    def __get_records(self, symbol):
+
+        if symbol not in self.__records:
+            filename = self.__get_data_filename(symbol)
+            size = os.path.getsize(filename) // self.__record_dtype.itemsize if os.path.exists(filename) else 0
+            self.__records[symbol] = np.memmap(filename, dtype=self.__record_dtype, mode='r', shape=(size,)) if size else np.empty(0, dtype=self.__record_dtype)
+
+        return self.__records[symbol]
+
+    def __load_ranges(self, symbol):
+
+        filename = self.__get_ranges_filename(symbol)
+        if not os.path.exists(filename):
+            return []
+
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+    def __save_ranges(self, symbol, ranges):
+
+        filename = self.__get_ranges_filename(symbol)
+        with open(filename + '.tmp', 'w') as f:
+            json.dump(ranges, f)
+
+        os.replace(filename + '.tmp', filename)
+
+    def __get_data_filename(self, symbol):
+
+        return os.path.join(self.__folder, '{}.ohlcv'.format(symbol))
+
+    def __get_ranges_filename(self, symbol):
+
+        return os.path.join(self.__folder, '{}.ranges'.format(symbol))
+
+    def __to_days(self, date):
+
+        if isinstance(date, str):
+            date = datetime.datetime.strptime(date, '%Y-%m-%d').date()
+        elif isinstance(date, datetime.datetime):
+            date = date.date()
+
+        return (date - self.__epoch).days
+
+    def __to_date(self, days):
+
+        return self.__epoch + datetime.timedelta(days=int(days))
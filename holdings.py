@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import numpy as np
+import pandas as pd
+
+class Holdings:
+
+    __revalue_updates = 10000
+
+    def __init__(self, holdings=None, settlement='48hs'):
+        """
+        Class constructor.
+
+        The holdings keep the quantity and the last price of each position, and the total market value of the
+        portfolio.  When a price changes (on_personal_portfolio), the total is adjusted by the change of that
+        position only, so the cost of each tick is proportional to the number of securities received.
+
+        Parameters
+        ----------
+        holdings : pandas.DataFrame, optional
+            Positions returned by SHDA.get_holdings (columns symbol, quantity and price).
+        settlement : str, optional
+            Settlement of the prices used to value the positions (spot, 24hs or 48hs).  The quotes of the other
+            settlements are ignored, so a symbol quoted in several settlements is not valued with each of them in
+            turn.  None uses the quotes of all the settlements.  Default: 48hs.
+        """
+
+        self.__settlement = settlement
+        self.__rows = {}
+        self.__symbols = []
+        self.__quantities = np.empty(0, dtype=np.float64)
+        self.__prices = np.empty(0, dtype=np.float64)
+        self.__value = 0.0
+        self.__updates = 0
+        self.__lock = threading.Lock()
+
+        if holdings is not None:
+            self.set_holdings(holdings)
+
+    def __len__(self):
+
+        return len(self.__symbols)
+
+    def __contains__(self, symbol):
+
+        return symbol in self.__rows
+
+    def set_holdings(self, holdings):
+        """
+        Replace all the positions with the holdings received (columns symbol, quantity and price).
+        """
+
+        holdings = holdings.groupby('symbol', sort=False).agg(quantity=('quantity', 'sum'), price=('price', 'last'))
+
+        with self.__lock:
+            self.__symbols = holdings.index.tolist()
+            self.__rows = {symbol: row for row, symbol in enumerate(self.__symbols)}
+            self.__quantities = holdings['quantity'].to_numpy(dtype=np.float64, copy=True)
+            self.__prices = holdings['price'].to_numpy(dtype=np.float64, copy=True)
+            self.__revalue()
+
+    def set_position(self, symbol, quantity, price=None):
+        """
+        Set the quantity of a position (and optionally its price).  A zero quantity removes the position value.
+        """
+
+        with self.__lock:
+            row = self.__rows.get(symbol)
+            if row is None:
+                row = self.__rows[symbol] = len(self.__symbols)
+                self.__symbols.append(symbol)
+                self.__quantities = np.append(self.__quantities, 0.0)
+                self.__prices = np.append(self.__prices, np.nan if price is None else price)
+
+            previous = self.__position_value(row)
+            self.__quantities[row] = quantity
+            if price is not None:
+                self.__prices[row] = price
+
+            self.__value += self.__position_value(row) - previous
+
+    def update_prices(self, symbols, prices, settlements=None):
+        """
+        Update the prices of the positions, adjusting the market value with the positions that changed.
+
+        Parameters
+        ----------
+        symbols : list of str
+            Symbols of the securities.  The symbols that are not in the holdings are ignored.
+        prices : list of float
+            Last price of each symbol.  The NaN prices are ignored.
+        settlements : list of str, optional
+            Settlement of each price.  The prices of a settlement other than the one of the holdings are ignored.
+        """
+
+        if settlements is None or self.__settlement is None:
+            settlements = [self.__settlement] * len(prices)
+
+        with self.__lock:
+            for symbol, price, settlement in zip(symbols, prices, settlements):
+                row = self.__rows.get(symbol)
+                if row is None or settlement != self.__settlement or price != price or price == self.__prices[row]:
+                    continue
+
+                previous = self.__position_value(row)
+                self.__prices[row] = price
+                self.__value += self.__position_value(row) - previous
+                self.__updates += 1
+
+            # Avoid the accumulation of rounding errors of the incremental updates
+            if self.__updates >= self.__revalue_updates:
+                self.__revalue()
+
+    def get_value(self):
+        """
+        Return the market value of the portfolio (the positions without price are not included).
+        """
+
+        with self.__lock:
+            return self.__value
+
+    def get_positions(self):
+        """
+        Return the positions as a DataFrame with the columns symbol, quantity, price, value and weight.
+        """
+
+        with self.__lock:
+            df = pd.DataFrame({'symbol': self.__symbols, 'quantity': self.__quantities.copy(), 'price': self.__prices.copy()})
+            value = self.__value
+
+        df['value'] = df['quantity'] * df['price']
+        df['weight'] = df['value'] / value if value else np.nan
+
+        return df
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_personal_portfolio(self, online, portfolio_quotes, order_book_quotes):
+
+        if portfolio_quotes is None or portfolio_quotes.empty:
+            return
+
+        symbols = self.__get_values(portfolio_quotes, 'symbol')
+        settlements = self.__get_values(portfolio_quotes, 'settlement')
+        self.update_prices(symbols, portfolio_quotes['last'].to_numpy(dtype=np.float64), settlements)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_values(self, df, column):
+
+        return df.index.get_level_values(column) if column in df.index.names else df[column]
+
+    def __position_value(self, row):
+
+        value = self.__quantities[row] * self.__prices[row]
+        return 0.0 if value != value else value
+
+    def __revalue(self):
+
+        values = self.__quantities * self.__prices
+        self.__value = float(np.nansum(values))
+        self.__updates = 0
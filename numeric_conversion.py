@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from functools import lru_cache
+import numpy as np
+
+_nan = float('nan')
+_nat = -2 ** 63
+
+_boards = {
+    'accionesLideres': 'bluechips',
+    'panelGeneral': 'general_board',
+    'cedears': 'cedears',
+    'rentaFija': 'government_bonds',
+    'letes': 'short_term_government_bonds',
+    'obligaciones': 'corporate_bonds'}
+
+def convert_to_numeric_columns(df, columns):
+    """
+    Convert the columns of a DataFrame to float in a single pass.
+
+    The text values use the broker locale (dot as thousands separator and comma as decimal separator)
+    and '-' means that there is no value.  All the text columns are converted together as one block,
+    while the columns that are already numeric are only cast to float.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame to convert.  It is modified in place and returned.
+    columns : list of str
+        Columns to convert.
+    """
+
+    numeric_columns, text_columns = _get_conversion_plan(tuple(columns), tuple(df[column].dtype for column in columns))
+
+    for column in numeric_columns:
+        df[column] = df[column].astype(np.float64)
+
+    if text_columns and len(df):
+        block = df[list(text_columns)].to_numpy(dtype=object)
+        values = convert_to_numeric(block.ravel(order='F'))
+        for i, column in enumerate(text_columns):
+            df[column] = values[i * len(df):(i + 1) * len(df)]
+    elif text_columns:
+        for column in text_columns:
+            df[column] = df[column].astype(np.float64)
+
+    return df
+
+def convert_to_numeric(values):
+    """
+    Convert a one dimensional array of numbers and locale formatted texts to a float array.
+
+    Parameters
+    ----------
+    values : numpy.ndarray or list
+        Values to convert.  The values that cannot be converted are returned as NaN.
+    """
+
+    return np.fromiter(map(to_float, values), dtype=np.float64, count=len(values))
+
+def to_float(value):
+    """
+    Convert a number or a locale formatted text to float, returning NaN when it cannot be converted.
+    """
+
+    if value.__class__ is str:
+        if value == '-':
+            return _nan
+
+        try:
+            return float(value.replace('.', '').replace(',', '.'))
+        except ValueError:
+            return _nan
+
+    if value is None:
+        return _nan
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _nan
+
+def to_epoch_ns(date, hour, cache):
+    """
+    Convert a trade date (YYYYMMDD) and hour (HH:MM:SS) to nanoseconds since 1970-01-01, returning the NaT value
+    (-2 ** 63) when they cannot be converted.
+
+    Parameters
+    ----------
+    date : str
+        Trade date.
+    hour : str
+        Trade hour.
+    cache : dict
+        Dates already converted, shared by the calls of the same message.
+    """
+
+    if date not in cache:
+        try:
+            cache[date] = np.datetime64('{}-{}-{}'.format(date[0:4], date[4:6], date[6:8]), 'ns').astype(np.int64)
+        except (TypeError, ValueError):
+            cache[date] = _nat
+
+    if cache[date] == _nat:
+        return _nat
+
+    try:
+        hours, minutes, seconds = hour.split(':')
+        return cache[date] + int((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1e9)
+    except (AttributeError, ValueError):
+        return _nat
+
+def to_board(panel):
+    """
+    Convert the panel of a quote (accionesLideres, panelGeneral, ...) to the board name, returning an empty string
+    for the unknown panels.
+    """
+
+    return _boards.get(panel, '')
+
+@lru_cache(maxsize=256)
+def _get_conversion_plan(columns, dtypes):
+    import pandas as pd
+
+    numeric_columns = tuple(column for column, dtype in zip(columns, dtypes) if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype))
+    text_columns = tuple(column for column in columns if column not in numeric_columns)
+
+    return numeric_columns, text_columns
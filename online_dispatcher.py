@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+class OnlineDispatcher:
+
+    __kinds = ['securities', 'options', 'repos', 'portfolio', 'portfolio_order_book']
+    __order_book_kinds = ['portfolio_order_book']
+
+    def __init__(self, on_securities=None, on_options=None, on_repos=None, on_personal_portfolio=None, on_error=None, interval=0.1, batch_size=1000, max_pending=100000):
+        """
+        Class constructor.
+
+        The dispatcher methods on_securities, on_options, on_repos and on_personal_portfolio are passed
+        to HomeBroker instead of the user callbacks.  They only queue the quotes received, so the SignalR
+        thread is never blocked by a slow consumer.  A dispatch thread coalesces the queued quotes of the
+        same security (keeping the latest one) and calls the user callbacks with a batch of them.
+
+        The quotes of the same security are identified by the index of the DataFrames received (symbol
+        and settlement in the online module).  The order books have one row per level under the same
+        index, so only the latest full book of each security is kept.
+
+        Parameters
+        ----------
+        on_securities : function(online, quotes), optional
+            Called with the coalesced securities quotes.
+        on_options : function(online, quotes), optional
+            Called with the coalesced options quotes.
+        on_repos : function(online, quotes), optional
+            Called with the coalesced repos quotes.
+        on_personal_portfolio : function(online, portfolio_quotes, order_book_quotes), optional
+            Called with the coalesced personal portfolio quotes.
+        on_error : function(online, exception, connection_lost), optional
+            Called when a user callback raises an exception.
+        interval : float, optional
+            Maximum number of seconds a quote waits before it is delivered.  Default: 0.1.
+        batch_size : int, optional
+            Number of queued quotes that triggers a delivery before the interval expires.  Default: 1000.
+        max_pending : int, optional
+            Maximum number of queued quotes.  When the queue is full the oldest queued messages are
+            dropped to make room for the new one.  Default: 100000.
+        """
+
+        self.__callbacks = {
+            'securities': on_securities,
+            'options': on_options,
+            'repos': on_repos,
+            'portfolio': on_personal_portfolio }
+
+        self.__on_error = on_error
+        self.__interval = interval
+        self.__batch_size = batch_size
+        self.__max_pending = max_pending
+
+        self.__online = None
+        self.__pending = {kind: [] for kind in self.__kinds}
+        self.__arrivals = deque()
+        self.__pending_count = 0
+        self.__metrics = {'received': 0, 'delivered': 0, 'coalesced': 0, 'dropped': 0, 'batches': 0}
+
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__running = False
+
+    def __enter__(self):
+
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.stop()
+
+    def start(self):
+        """
+        Start the dispatch thread.
+        """
+
+        with self.__condition:
+            if self.__running:
+                return
+
+            self.__running = True
+            self.__thread = threading.Thread(target=self.__run, name='OnlineDispatcher', daemon=True)
+            self.__thread.start()
+
+    def stop(self, flush=True):
+        """
+        Stop the dispatch thread.
+
+        Parameters
+        ----------
+        flush : bool, optional
+            Deliver the queued quotes before stopping.  Default: True.
+        """
+
+        with self.__condition:
+            if not self.__running:
+                return
+
+            self.__running = False
+            if not flush:
+                self.__clear()
+
+            self.__condition.notify()
+
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
+
+        self.__thread = None
+
+    def get_metrics(self):
+        """
+        Return the dispatcher counters.
+
+        Returns
+        -------
+        dict
+            received: quotes received, delivered: quotes delivered to the callbacks, coalesced: quotes
+            replaced by a newer quote of the same security before being delivered, dropped: quotes
+            discarded because the queue was full, batches: number of deliveries, pending: quotes queued.
+        """
+
+        with self.__condition:
+            metrics = dict(self.__metrics)
+            metrics['pending'] = self.__pending_count
+
+        return metrics
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_securities(self, online, quotes):
+
+        self.__enqueue(online, [('securities', quotes)])
+
+    def on_options(self, online, quotes):
+
+        self.__enqueue(online, [('options', quotes)])
+
+    def on_repos(self, online, quotes):
+
+        self.__enqueue(online, [('repos', quotes)])
+
+    def on_personal_portfolio(self, online, portfolio_quotes, order_book_quotes):
+
+        self.__enqueue(online, [('portfolio', portfolio_quotes), ('portfolio_order_book', order_book_quotes)])
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __enqueue(self, online, messages):
+
+        messages = [(kind, quotes) for kind, quotes in messages if quotes is not None and not quotes.empty]
+        count = sum(len(quotes) for _, quotes in messages)
+
+        with self.__condition:
+            self.__online = online
+            self.__metrics['received'] += count
+
+            if count > self.__max_pending:
+                self.__metrics['dropped'] += count
+                return
+
+            # The newest quotes replace the oldest ones, so the queue is never left with stale quotes
+            while self.__pending_count + count > self.__max_pending:
+                kind = self.__arrivals.popleft()
+                quotes = self.__pending[kind].pop(0)
+                self.__pending_count -= len(quotes)
+                self.__metrics['dropped'] += len(quotes)
+
+            for kind, quotes in messages:
+                self.__pending[kind].append(quotes)
+                self.__arrivals.append(kind)
+
+            self.__pending_count += count
+            if self.__pending_count >= self.__batch_size:
+                self.__condition.notify()
+
+    def __coalesce(self, pending):
+
+        batch = {}
+        coalesced = 0
+        for kind, frames in pending.items():
+            if not frames:
+                batch[kind] = None
+                continue
+
+            df = pd.concat(frames) if len(frames) > 1 else frames[0]
+            if kind in self.__order_book_kinds:
+                if len(frames) > 1:
+                    # Keep all the levels of the last book received of each security
+                    messages = pd.Series(np.repeat(np.arange(len(frames)), [len(frame) for frame in frames]), index=df.index)
+                    last = messages.groupby(level=list(range(df.index.nlevels))).transform('max')
+                    batch[kind] = df[(messages == last).to_numpy()]
+                else:
+                    batch[kind] = df
+            elif df.index.has_duplicates:
+                batch[kind] = df[~df.index.duplicated(keep='last')]
+            else:
+                batch[kind] = df
+
+            coalesced += len(df) - len(batch[kind])
+
+        return batch, coalesced
+
+    def __clear(self):
+
+        self.__metrics['dropped'] += self.__pending_count
+        self.__pending = {kind: [] for kind in self.__kinds}
+        self.__arrivals = deque()
+        self.__pending_count = 0
+
+    def __run(self):
+
+        while True:
+            with self.__condition:
+                deadline = time.monotonic() + self.__interval
+                while self.__running and self.__pending_count < self.__batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+
+                    self.__condition.wait(remaining)
+
+                # Only the queue is swapped while holding the lock, so the SignalR thread is not
+                # blocked while the quotes are coalesced
+                running = self.__running
+                pending = self.__pending
+                count = self.__pending_count
+                online = self.__online
+
+                self.__pending = {kind: [] for kind in self.__kinds}
+                self.__arrivals = deque()
+                self.__pending_count = 0
+
+            if count:
+                batch, coalesced = self.__coalesce(pending)
+
+                with self.__condition:
+                    self.__metrics['coalesced'] += coalesced
+                    self.__metrics['delivered'] += count - coalesced
+                    self.__metrics['batches'] += 1
+
+                self.__deliver(online, batch)
+
+            if not running:
+                break
+
+    def __deliver(self, online, batch):
+
+        for kind in ['securities', 'options', 'repos']:
+            if batch[kind] is not None:
+                self.__call(self.__callbacks[kind], online, batch[kind])
+
+        if batch['portfolio'] is not None or batch['portfolio_order_book'] is not None:
+            self.__call(self.__callbacks['portfolio'], online, batch['portfolio'], batch['portfolio_order_book'])
+
+    def __call(self, callback, online, *args):
+
+        if not callback:
+            return
+
+        try:
+            callback(online, *args)
+        except Exception as ex:
+            if self.__on_error:
+                self.__on_error(online, ex, False)
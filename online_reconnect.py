@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import random
+import threading
+
+class OnlineReconnector:
+
+    def __init__(self, online=None, on_error=None, on_snapshot=None, retries=None, backoff=1.0, max_backoff=60.0):
+        """
+        Class constructor.
+
+        The reconnector keeps the active subscriptions of the online module.  Its on_error method is passed
+        to HomeBroker, and when the connection is lost it connects again, replays all the subscriptions and
+        gets a market snapshot to fill the gap.
+
+        Parameters
+        ----------
+        online : object, optional
+            Online module of the client (hb.online).  It can also be set with attach.
+        on_error : function(online, exception, connection_lost), optional
+            User error callback.  It is called for all the errors, before reconnecting.
+        on_snapshot : function(online, snapshot), optional
+            Called with the result of get_market_snapshot after the subscriptions are replayed
+            (for example QuoteTable.update_market_snapshot).
+        retries : int, optional
+            Maximum number of reconnection attempts.  Default: None (retry until disconnect is called).
+        backoff : float, optional
+            Seconds to wait before the first retry.  The wait is doubled on each retry, up to max_backoff, and
+            a random jitter of up to half the wait is subtracted.  Default: 1.
+        max_backoff : float, optional
+            Maximum number of seconds to wait between retries.  Default: 60.
+        """
+
+        self.__online = online
+        self.__on_error = on_error
+        self.__on_snapshot = on_snapshot
+        self.__retries = retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+
+        self.__subscriptions = {}
+        self.__metrics = {'disconnections': 0, 'reconnections': 0, 'failed_attempts': 0, 'last_reconnect_latency': None, 'last_gap': None}
+
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def attach(self, online):
+        """
+        Set the online module that is reconnected.
+        """
+
+        self.__online = online
+
+    def get_subscriptions(self):
+        """
+        Return the active subscriptions as a list of (method name, arguments).
+        """
+
+        with self.__lock:
+            return list(self.__subscriptions)
+
+    def get_metrics(self):
+        """
+        Return the reconnection counters.
+
+        Returns
+        -------
+        dict
+            disconnections: connections lost, reconnections: successful reconnections, failed_attempts: failed
+            connection attempts, last_reconnect_latency: seconds from the connection lost until it was connected
+            again, last_gap: seconds from the connection lost until the market snapshot was received.
+        """
+
+        with self.__lock:
+            return dict(self.__metrics)
+
+    def connect(self):
+
+        self.__stopped.clear()
+        self.__online.connect()
+
+    def disconnect(self):
+
+        self.__stopped.set()
+
+        thread = self.__thread
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+        self.__online.disconnect()
+
+    def subscribe_securities(self, board, settlement):
+
+        self.__subscribe('subscribe_securities', board, settlement)
+
+    def unsubscribe_securities(self, board, settlement):
+
+        self.__unsubscribe('subscribe_securities', 'unsubscribe_securities', board, settlement)
+
+    def subscribe_options(self):
+
+        self.__subscribe('subscribe_options')
+
+    def unsubscribe_options(self):
+
+        self.__unsubscribe('subscribe_options', 'unsubscribe_options')
+
+    def subscribe_repos(self):
+
+        self.__subscribe('subscribe_repos')
+
+    def unsubscribe_repos(self):
+
+        self.__unsubscribe('subscribe_repos', 'unsubscribe_repos')
+
+    def subscribe_personal_portfolio(self, *args):
+
+        self.__subscribe('subscribe_personal_portfolio', *args)
+
+    def unsubscribe_personal_portfolio(self, *args):
+
+        self.__unsubscribe('subscribe_personal_portfolio', 'unsubscribe_personal_portfolio', *args)
+
+    def subscribe_order_book(self, symbol, settlement):
+
+        self.__subscribe('subscribe_order_book', symbol, settlement)
+
+    def unsubscribe_order_book(self, symbol, settlement):
+
+        self.__unsubscribe('subscribe_order_book', 'unsubscribe_order_book', symbol, settlement)
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_error(self, online, exception, connection_lost):
+
+        if self.__on_error:
+            self.__on_error(online, exception, connection_lost)
+
+        if not connection_lost or self.__stopped.is_set():
+            return
+
+        with self.__lock:
+            if self.__thread and self.__thread.is_alive():
+                return
+
+            self.__metrics['disconnections'] += 1
+            self.__thread = threading.Thread(target=self.__reconnect, args=(time.monotonic(),), name='OnlineReconnector', daemon=True)
+            self.__thread.start()
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __subscribe(self, method, *args):
+
+        getattr(self.__online, method)(*args)
+
+        with self.__lock:
+            self.__subscriptions[(method, args)] = None
+
+    def __unsubscribe(self, subscribe_method, method, *args):
+
+        with self.__lock:
+            self.__subscriptions.pop((subscribe_method, args), None)
+
+        getattr(self.__online, method)(*args)
+
+    def __reconnect(self, lost_time):
+
+        attempt = 0
+        while not self.__stopped.is_set():
+            try:
+                try:
+                    self.__online.disconnect()
+                except Exception:
+                    pass
+
+                self.__online.connect()
+                connected_time = time.monotonic()
+
+                for method, args in self.get_subscriptions():
+                    getattr(self.__online, method)(*args)
+
+                snapshot = self.__online.get_market_snapshot()
+            except Exception as ex:
+                with self.__lock:
+                    self.__metrics['failed_attempts'] += 1
+
+                if self.__on_error:
+                    self.__on_error(self.__online, ex, True)
+
+                attempt += 1
+                if self.__retries is not None and attempt > self.__retries:
+                    return
+
+                # The exponent is capped so a long outage cannot overflow the float conversion, and the jitter is
+                # applied after the cap so the clients that reached it do not retry at the same time
+                wait = min(self.__max_backoff, self.__backoff * (2 ** min(attempt - 1, 30))) * (0.5 + random.random() / 2)
+                self.__stopped.wait(wait)
+                continue
+
+            if self.__on_snapshot:
+                self.__on_snapshot(self.__online, snapshot)
+
+            with self.__lock:
+                self.__metrics['reconnections'] += 1
+                self.__metrics['last_reconnect_latency'] = connected_time - lost_time
+                self.__metrics['last_gap'] = time.monotonic() - lost_time
+
+            return
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+from collections import deque, namedtuple
+
+OpenEvent = namedtuple('OpenEvent', [])
+SecuritiesEvent = namedtuple('SecuritiesEvent', ['quotes'])
+OptionsEvent = namedtuple('OptionsEvent', ['quotes'])
+ReposEvent = namedtuple('ReposEvent', ['quotes'])
+OrderBookEvent = namedtuple('OrderBookEvent', ['quotes'])
+PersonalPortfolioEvent = namedtuple('PersonalPortfolioEvent', ['portfolio_quotes', 'order_book_quotes'])
+ErrorEvent = namedtuple('ErrorEvent', ['exception', 'connection_lost'])
+CloseEvent = namedtuple('CloseEvent', [])
+
+class _StreamConsumer:
+
+    def __init__(self, event_types, max_pending):
+
+        self.event_types = event_types
+        self.events = deque()
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.waiter = None
+
+    def accepts(self, event):
+
+        # The close event ends all the iterators, so it is always delivered
+        return not self.event_types or isinstance(event, self.event_types) or isinstance(event, CloseEvent)
+
+class OnlineStream:
+
+    __control_events = (OpenEvent, ErrorEvent, CloseEvent)
+
+    def __init__(self, online=None, max_pending=10000, timeout=1.0):
+        """
+        Class constructor.
+
+        The callbacks returned by get_callbacks are passed to HomeBroker, and the events received are
+        consumed with "async for event in stream.stream()".  Each stream iterator has its own queue, so
+        several consumers (for example one per event type) receive the events independently.  The SignalR
+        thread only appends the event to the queues, and it only wakes up the event loop when a consumer
+        is waiting for an event, so a burst of messages is consumed without a thread switch per message.
+
+        The events received while no consumer is attached are queued (up to max_pending quote events)
+        and delivered to the next consumer that attaches.
+
+        Parameters
+        ----------
+        online : object, optional
+            Online module of the client (hb.online).  It can also be set with attach.
+        max_pending : int, optional
+            Maximum number of quote events queued per consumer.  When the queue of a consumer is full,
+            the SignalR thread waits until the consumer reads an event (backpressure).  When no consumer
+            is attached the new event is dropped, so the connection is never frozen.  The open, error and
+            close events are never dropped.  Default: 10000.
+        timeout : float, optional
+            Maximum number of seconds the SignalR thread waits for room in the queue of a consumer.  After
+            that the event is dropped for that consumer.  Default: 1.
+        """
+
+        self.__online = online
+        self.__loop = None
+
+        self.__max_pending = max_pending
+        self.__timeout = timeout
+        self.__backlog = deque()
+        self.__backlog_count = 0
+        self.__consumers = []
+        self.__dropped = 0
+        self.__lock = threading.Lock()
+
+    def attach(self, online):
+        """
+        Set the online module used by connect, disconnect and the subscribe methods.
+        """
+
+        self.__online = online
+
+    def get_callbacks(self):
+        """
+        Return the callbacks to pass to HomeBroker (HomeBroker(broker, **stream.get_callbacks())).
+        """
+
+        return {
+            'on_open': self.on_open,
+            'on_personal_portfolio': self.on_personal_portfolio,
+            'on_securities': self.on_securities,
+            'on_options': self.on_options,
+            'on_repos': self.on_repos,
+            'on_order_book': self.on_order_book,
+            'on_error': self.on_error,
+            'on_close': self.on_close }
+
+    async def stream(self, *event_types):
+        """
+        Yield the events received until the connection is closed.
+
+        Parameters
+        ----------
+        event_types : type, optional
+            Event types to yield (for example SecuritiesEvent, OrderBookEvent).  Default: all the events.
+        """
+
+        self.__bind()
+
+        consumer = _StreamConsumer(event_types, self.__max_pending)
+        with self.__lock:
+            for event in self.__backlog:
+                if consumer.accepts(event) and (isinstance(event, self.__control_events) or consumer.slots.acquire(False)):
+                    consumer.events.append(event)
+
+            self.__backlog.clear()
+            self.__backlog_count = 0
+            self.__consumers.append(consumer)
+
+        try:
+            while True:
+                with self.__lock:
+                    if consumer.events:
+                        event = consumer.events.popleft()
+                        waiter = None
+                    else:
+                        event = None
+                        waiter = consumer.waiter = self.__loop.create_future()
+
+                if waiter is not None:
+                    try:
+                        await waiter
+                    finally:
+                        with self.__lock:
+                            if consumer.waiter is waiter:
+                                consumer.waiter = None
+                    continue
+
+                if not isinstance(event, self.__control_events):
+                    consumer.slots.release()
+
+                if not event_types or isinstance(event, event_types):
+                    yield event
+
+                if isinstance(event, CloseEvent):
+                    return
+        finally:
+            with self.__lock:
+                self.__consumers.remove(consumer)
+
+    def get_metrics(self):
+        """
+        Return the stream counters.
+
+        Returns
+        -------
+        dict
+            pending: events queued (in all the consumer queues and while no consumer is attached), dropped: quote
+            events discarded because a queue was full, consumers: number of stream iterators attached.
+        """
+
+        with self.__lock:
+            pending = len(self.__backlog) + sum(len(consumer.events) for consumer in self.__consumers)
+            return {'pending': pending, 'dropped': self.__dropped, 'consumers': len(self.__consumers)}
+
+    async def connect(self):
+
+        await self.__run(self.__online.connect)
+
+    async def disconnect(self):
+
+        await self.__run(self.__online.disconnect)
+
+    async def subscribe_securities(self, board, settlement):
+
+        await self.__run(self.__online.subscribe_securities, board, settlement)
+
+    async def unsubscribe_securities(self, board, settlement):
+
+        await self.__run(self.__online.unsubscribe_securities, board, settlement)
+
+    async def subscribe_options(self):
+
+        await self.__run(self.__online.subscribe_options)
+
+    async def unsubscribe_options(self):
+
+        await self.__run(self.__online.unsubscribe_options)
+
+    async def subscribe_repos(self):
+
+        await self.__run(self.__online.subscribe_repos)
+
+    async def unsubscribe_repos(self):
+
+        await self.__run(self.__online.unsubscribe_repos)
+
+    async def subscribe_order_book(self, symbol, settlement):
+
+        await self.__run(self.__online.subscribe_order_book, symbol, settlement)
+
+    async def unsubscribe_order_book(self, symbol, settlement):
+
+        await self.__run(self.__online.unsubscribe_order_book, symbol, settlement)
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_open(self, online):
+
+        self.__put(OpenEvent())
+
+    def on_personal_portfolio(self, online, portfolio_quotes, order_book_quotes):
+
+        self.__put(PersonalPortfolioEvent(portfolio_quotes, order_book_quotes))
+
+    def on_securities(self, online, quotes):
+
+        self.__put(SecuritiesEvent(quotes))
+
+    def on_options(self, online, quotes):
+
+        self.__put(OptionsEvent(quotes))
+
+    def on_repos(self, online, quotes):
+
+        self.__put(ReposEvent(quotes))
+
+    def on_order_book(self, online, quotes):
+
+        self.__put(OrderBookEvent(quotes))
+
+    def on_error(self, online, exception, connection_lost):
+
+        self.__put(ErrorEvent(exception, connection_lost))
+
+    def on_close(self, online):
+
+        self.__put(CloseEvent())
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __bind(self):
+
+        loop = asyncio.get_running_loop()
+        if self.__loop is None:
+            self.__loop = loop
+        elif self.__loop is not loop:
+            raise RuntimeError('The stream is bound to another event loop.')
+
+    async def __run(self, method, *args):
+
+        self.__bind()
+        await self.__loop.run_in_executor(None, method, *args)
+
+    def __put(self, event):
+
+        is_control = isinstance(event, self.__control_events)
+
+        with self.__lock:
+            consumers = [consumer for consumer in self.__consumers if consumer.accepts(event)]
+            if not self.__consumers:
+                # Only wait for room while a consumer is reading, otherwise the SignalR thread (and the
+                # whole connection) would be blocked until a consumer is attached
+                if is_control or self.__backlog_count < self.__max_pending:
+                    self.__backlog.append(event)
+                    self.__backlog_count += 0 if is_control else 1
+                else:
+                    self.__dropped += 1
+                return
+
+        for consumer in consumers:
+            if not is_control and not consumer.slots.acquire(timeout=self.__timeout):
+                with self.__lock:
+                    self.__dropped += 1
+                continue
+
+            with self.__lock:
+                consumer.events.append(event)
+                waiter = consumer.waiter
+                consumer.waiter = None
+
+            if waiter is not None:
+                self.__loop.call_soon_threadsafe(self.__wake, waiter)
+
+    @staticmethod
+    def __wake(waiter):
+
+        if not waiter.done():
+            waiter.set_result(None)
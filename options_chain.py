@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+_seconds_per_year = 365.0 * 24 * 3600
+
+def _norm_cdf(x):
+
+    # Abramowitz and Stegun 7.1.26 (absolute error below 1.5e-7)
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    erf = 1.0 - (((((1.061405429 * t - 1.453152027) * t) + 1.421413741) * t - 0.284496736) * t + 0.254829592) * t * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+def _norm_pdf(x):
+
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+def black_scholes(spot, strike, years, rate, volatility, is_call):
+    """
+    Return the Black-Scholes price and greeks of European options (all the parameters can be arrays).
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        price, delta, gamma, vega (per 1.00 of volatility) and theta (per year).
+    """
+
+    sqrt_years = np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility * volatility) * years) / (volatility * sqrt_years)
+    d2 = d1 - volatility * sqrt_years
+    discount = np.exp(-rate * years)
+    pdf_d1 = _norm_pdf(d1)
+
+    call_price = spot * _norm_cdf(d1) - strike * discount * _norm_cdf(d2)
+    price = np.where(is_call, call_price, call_price - spot + strike * discount)
+    delta = np.where(is_call, _norm_cdf(d1), _norm_cdf(d1) - 1.0)
+    gamma = pdf_d1 / (spot * volatility * sqrt_years)
+    vega = spot * pdf_d1 * sqrt_years
+    theta = -spot * pdf_d1 * volatility / (2.0 * sqrt_years) - np.where(is_call, rate * strike * discount * _norm_cdf(d2), -rate * strike * discount * _norm_cdf(-d2))
+
+    return {'price': price, 'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta}
+
+def implied_volatility(price, spot, strike, years, rate, is_call, iterations=30, tolerance=1e-6):
+    """
+    Return the Black-Scholes implied volatility of European options (all the parameters can be arrays).
+
+    A Newton step is taken when it stays inside the current bracket and a bisection step otherwise,
+    for all the options at the same time.  The options whose price is outside the no-arbitrage bounds are NaN.
+    """
+
+    price, spot, strike, years, rate, is_call = np.broadcast_arrays(*[np.asarray(value, dtype=np.float64) if i != 5 else np.asarray(value, dtype=bool) for i, value in enumerate((price, spot, strike, years, rate, is_call))])
+
+    discount = np.exp(-rate * years)
+    lower_bound = np.where(is_call, np.maximum(spot - strike * discount, 0.0), np.maximum(strike * discount - spot, 0.0))
+    upper_bound = np.where(is_call, spot, strike * discount)
+    valid = (price > lower_bound) & (price < upper_bound) & (years > 0) & (spot > 0) & (strike > 0)
+
+    low = np.full(price.shape, 1e-4)
+    high = np.full(price.shape, 5.0)
+    volatility = np.full(price.shape, 0.5)
+
+    with np.errstate(all='ignore'):
+        for _ in range(iterations):
+            values = black_scholes(spot, strike, years, rate, volatility, is_call)
+            difference = values['price'] - price
+            if np.all(np.abs(difference[valid]) < tolerance):
+                break
+
+            high = np.where(difference > 0, volatility, high)
+            low = np.where(difference > 0, low, volatility)
+            newton = volatility - difference / values['vega']
+            volatility = np.where((newton > low) & (newton < high), newton, 0.5 * (low + high))
+
+    return np.where(valid, volatility, np.nan)
+
+class _Chain:
+
+    def __init__(self):
+
+        self.rows = {}
+        self.symbols = []
+        self.expirations = []
+        self.strikes = []
+        self.kinds = []
+        self.prices = []
+        self.spot = np.nan
+        self.arrays = None
+        self.greeks = None
+
+class OptionsChain:
+
+    __greeks_columns = ['iv', 'delta', 'gamma', 'vega', 'theta']
+
+    def __init__(self, rate=0.0, now=None):
+        """
+        Class constructor.
+
+        The chain keeps the options received by on_options indexed by underlying asset, expiration, strike and
+        kind (CALL/PUT).  The implied volatility and the greeks of all the options of an underlying are calculated
+        in a single vectorized pass when the last price of the underlying (received by on_securities) changes,
+        or on the next query after an option price changes.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Annual risk free rate (continuously compounded) used in Black-Scholes.  Default: 0.
+        now : function, optional
+            Function that returns the current time as epoch seconds (used to calculate the time to expiration).  Default: time.time.
+        """
+
+        self.__rate = rate
+        self.__now = now or time.time
+        self.__chains = {}
+        self.__lock = threading.RLock()
+
+    def get_underlyings(self):
+        """
+        Return the underlying assets with options in the chain.
+        """
+
+        with self.__lock:
+            return sorted(self.__chains)
+
+    def get_expirations(self, underlying):
+        """
+        Return the expirations of the options of an underlying asset.
+        """
+
+        with self.__lock:
+            chain = self.__chains.get(underlying)
+            return sorted(set(chain.expirations)) if chain else []
+
+    def get_strikes(self, underlying, expiration):
+        """
+        Return the strikes of the options of an underlying asset and expiration.
+        """
+
+        expiration = pd.Timestamp(expiration)
+        with self.__lock:
+            chain = self.__chains.get(underlying)
+            return sorted(set(strike for (exp, strike, _) in chain.rows if exp == expiration)) if chain else []
+
+    def get_option(self, underlying, expiration, strike, kind):
+        """
+        Return the option of an underlying asset, expiration, strike and kind (CALL or PUT) as a dict, or None if it does not exist.
+        """
+
+        with self.__lock:
+            chain = self.__chains.get(underlying)
+            row = chain.rows.get((pd.Timestamp(expiration), float(strike), kind)) if chain else None
+            if row is None:
+                return None
+
+            self.__calculate(chain)
+            option = {'symbol': chain.symbols[row], 'underlying_asset': underlying, 'expiration': chain.expirations[row], 'strike': chain.strikes[row], 'kind': chain.kinds[row], 'price': chain.arrays['price'][row], 'spot': chain.spot}
+            option.update({column: chain.greeks[column][row] for column in self.__greeks_columns})
+
+            return option
+
+    def get_chain(self, underlying, expiration=None):
+        """
+        Return the options of an underlying asset (optionally of a single expiration) with their implied volatility and greeks.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Columns symbol, expiration, strike, kind, price, iv, delta, gamma, vega (per 1.00 of volatility) and theta (per year),
+            sorted by expiration, strike and kind.
+        """
+
+        with self.__lock:
+            chain = self.__chains.get(underlying)
+            if not chain:
+                return pd.DataFrame(columns=['symbol', 'expiration', 'strike', 'kind', 'price'] + self.__greeks_columns)
+
+            self.__calculate(chain)
+            df = pd.DataFrame({
+                'symbol': chain.symbols, 'expiration': chain.expirations, 'strike': chain.arrays['strike'],
+                'kind': chain.kinds, 'price': chain.arrays['price'].copy(), **{column: chain.greeks[column].copy() for column in self.__greeks_columns}})
+
+        if expiration is not None:
+            df = df[df['expiration'] == pd.Timestamp(expiration)]
+
+        return df.sort_values(['expiration', 'strike', 'kind']).reset_index(drop=True)
+
+    def update_options(self, quotes):
+        """
+        Update the chain with the options quotes (columns strike, kind, expiration, underlying_asset, last, bid and ask).
+
+        The price of an option is its last price, or the mid price when there are no trades.
+        """
+
+        if quotes is None or quotes.empty:
+            return
+
+        if 'symbol' not in quotes.columns:
+            quotes = quotes.reset_index()
+
+        prices = quotes['last'].to_numpy(dtype=np.float64)
+        if 'bid' in quotes.columns and 'ask' in quotes.columns:
+            mid = (quotes['bid'].to_numpy(dtype=np.float64) + quotes['ask'].to_numpy(dtype=np.float64)) / 2
+            prices = np.where(np.isnan(prices) | (prices <= 0), mid, prices)
+
+        with self.__lock:
+            for symbol, underlying, expiration, strike, kind, price in zip(quotes['symbol'], quotes['underlying_asset'], pd.to_datetime(quotes['expiration']), quotes['strike'], quotes['kind'], prices):
+                if kind not in ('CALL', 'PUT') or pd.isna(expiration) or pd.isna(strike) or not underlying:
+                    continue
+
+                chain = self.__chains.get(underlying)
+                if chain is None:
+                    chain = self.__chains[underlying] = _Chain()
+
+                key = (expiration, float(strike), kind)
+                row = chain.rows.get(key)
+                if row is None:
+                    if chain.arrays is not None:
+                        chain.prices = chain.arrays['price'].tolist()
+                        chain.arrays = None
+
+                    chain.rows[key] = len(chain.symbols)
+                    chain.symbols.append(symbol)
+                    chain.expirations.append(expiration)
+                    chain.strikes.append(float(strike))
+                    chain.kinds.append(kind)
+                    chain.prices.append(price)
+                elif chain.arrays is not None:
+                    chain.arrays['price'][row] = price
+                else:
+                    chain.prices[row] = price
+
+                chain.greeks = None
+
+    def update_underlyings(self, quotes):
+        """
+        Update the last price of the underlying assets with the securities quotes, recalculating their chains when it changes.
+        """
+
+        if quotes is None or quotes.empty:
+            return
+
+        if 'symbol' not in quotes.columns:
+            quotes = quotes.reset_index()
+
+        with self.__lock:
+            for symbol, last in zip(quotes['symbol'], quotes['last'].to_numpy(dtype=np.float64)):
+                chain = self.__chains.get(symbol)
+                if chain is None or np.isnan(last) or last == chain.spot:
+                    continue
+
+                chain.spot = last
+                chain.greeks = None
+                self.__calculate(chain)
+
+    def set_underlying_price(self, underlying, price):
+        """
+        Set the last price of an underlying asset, recalculating its chain.
+        """
+
+        with self.__lock:
+            chain = self.__chains.get(underlying)
+            if chain is not None:
+                chain.spot = float(price)
+                chain.greeks = None
+                self.__calculate(chain)
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_options(self, online, quotes):
+
+        self.update_options(quotes)
+
+    def on_securities(self, online, quotes):
+
+        self.update_underlyings(quotes)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __calculate(self, chain):
+
+        if chain.arrays is None:
+            chain.arrays = {
+                'strike': np.array(chain.strikes, dtype=np.float64),
+                'expiration': np.array([expiration.value / 1e9 for expiration in chain.expirations], dtype=np.float64),
+                'is_call': np.array([kind == 'CALL' for kind in chain.kinds], dtype=bool),
+                'price': np.array(chain.prices, dtype=np.float64)}
+
+            # From here on the prices are updated in the array
+            chain.prices = chain.arrays['price']
+
+        if chain.greeks is not None:
+            return
+
+        arrays = chain.arrays
+        years = (arrays['expiration'] - self.__now()) / _seconds_per_year
+        volatility = implied_volatility(arrays['price'], chain.spot, arrays['strike'], years, self.__rate, arrays['is_call'])
+
+        with np.errstate(all='ignore'):
+            greeks = black_scholes(chain.spot, arrays['strike'], years, self.__rate, volatility, arrays['is_call'])
+
+        chain.greeks = {'iv': volatility, 'delta': greeks['delta'], 'gamma': greeks['gamma'], 'vega': greeks['vega'], 'theta': greeks['theta']}
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+
+class OrderBookSide:
+
+    def __init__(self, descending, capacity=16):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        descending : bool
+            True for the bid side (best price is the highest one), False for the ask side.
+        capacity : int, optional
+            Initial number of price levels allocated.  Default: 16.
+        """
+
+        self.__descending = descending
+        self.__keys = np.empty(capacity, dtype=np.float64)
+        self.__sizes = np.empty(capacity, dtype=np.float64)
+        self.__count = 0
+        self.__cumulative_sizes = None
+        self.__cumulative_amounts = None
+
+    def __len__(self):
+
+        return self.__count
+
+    def set_level(self, price, size):
+        """
+        Set the size of a price level.  The level is removed when the size is zero.
+        """
+
+        key = -price if self.__descending else price
+        position = int(np.searchsorted(self.__keys[:self.__count], key))
+        exists = position < self.__count and self.__keys[position] == key
+
+        if exists and size > 0:
+            self.__sizes[position] = size
+        elif exists:
+            self.__keys[position:self.__count - 1] = self.__keys[position + 1:self.__count]
+            self.__sizes[position:self.__count - 1] = self.__sizes[position + 1:self.__count]
+            self.__count -= 1
+        elif size > 0:
+            self.__reserve(self.__count + 1)
+            self.__keys[position + 1:self.__count + 1] = self.__keys[position:self.__count]
+            self.__sizes[position + 1:self.__count + 1] = self.__sizes[position:self.__count]
+            self.__keys[position] = key
+            self.__sizes[position] = size
+            self.__count += 1
+
+        self.__cumulative_sizes = None
+
+    def set_levels(self, prices, sizes):
+        """
+        Replace all the price levels of the side.
+        """
+
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        valid = ~np.isnan(prices) & ~np.isnan(sizes) & (sizes > 0)
+        keys = -prices[valid] if self.__descending else prices[valid]
+        sizes = sizes[valid]
+
+        order = np.argsort(keys, kind='stable')
+        self.__reserve(len(order))
+        self.__keys[:len(order)] = keys[order]
+        self.__sizes[:len(order)] = sizes[order]
+        self.__count = len(order)
+        self.__cumulative_sizes = None
+
+    def clear(self):
+        """
+        Remove all the price levels of the side.
+        """
+
+        self.__count = 0
+        self.__cumulative_sizes = None
+
+    def best(self):
+        """
+        Return the best (price, size) of the side, or None when the side is empty.
+        """
+
+        if not self.__count:
+            return None
+
+        return float(self.__price(self.__keys[0])), float(self.__sizes[0])
+
+    def depth(self, levels):
+        """
+        Return the prices and sizes of the best levels of the side, from the best to the worst price.
+        """
+
+        keys = self.__keys[:min(levels, self.__count)]
+        return (-keys if self.__descending else keys.copy()), self.__sizes[:len(keys)].copy()
+
+    def vwap(self, size):
+        """
+        Return the average price to trade the size against this side, or NaN if there is not enough size.
+        """
+
+        if size <= 0 or not self.__count:
+            return np.nan
+
+        if self.__cumulative_sizes is None:
+            self.__cumulative_sizes = np.cumsum(self.__sizes[:self.__count])
+            self.__cumulative_amounts = np.cumsum(self.__sizes[:self.__count] * self.__keys[:self.__count])
+
+        position = int(np.searchsorted(self.__cumulative_sizes, size))
+        if position == self.__count:
+            return np.nan
+
+        previous_size = self.__cumulative_sizes[position - 1] if position else 0.0
+        previous_amount = self.__cumulative_amounts[position - 1] if position else 0.0
+        amount = previous_amount + (size - previous_size) * self.__keys[position]
+
+        return float(self.__price(amount / size))
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __price(self, key):
+
+        return -key if self.__descending else key
+
+    def __reserve(self, capacity):
+
+        if capacity <= len(self.__keys):
+            return
+
+        capacity = max(capacity, 2 * len(self.__keys))
+        keys = np.empty(capacity, dtype=np.float64)
+        sizes = np.empty(capacity, dtype=np.float64)
+        keys[:self.__count] = self.__keys[:self.__count]
+        sizes[:self.__count] = self.__sizes[:self.__count]
+        self.__keys = keys
+        self.__sizes = sizes
+
+class OrderBook:
+
+    def __init__(self, symbol, settlement, capacity=16):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol of the security.
+        settlement : str
+            Settlement of the security (spot, 24hs, 48hs).
+        capacity : int, optional
+            Initial number of price levels allocated per side.  Default: 16.
+        """
+
+        self.symbol = symbol
+        self.settlement = settlement
+        self.bids = OrderBookSide(True, capacity)
+        self.asks = OrderBookSide(False, capacity)
+
+    def update(self, quotes):
+        """
+        Replace the book with the levels received in an on_order_book event.
+
+        Parameters
+        ----------
+        quotes : pandas.DataFrame
+            Order book quotes with the columns bid_size, bid, ask and ask_size (one row per position).
+        """
+
+        self.set_levels(quotes['bid'].to_numpy(), quotes['bid_size'].to_numpy(), quotes['ask'].to_numpy(), quotes['ask_size'].to_numpy())
+
+    def set_levels(self, bid_prices, bid_sizes, ask_prices, ask_sizes):
+        """
+        Replace the book with the levels received (arrays of prices and sizes per side).
+        """
+
+        self.bids.set_levels(bid_prices, bid_sizes)
+        self.asks.set_levels(ask_prices, ask_sizes)
+
+    def best_bid(self):
+        """
+        Return the best (price, size) of the bid side, or None when it is empty.
+        """
+
+        return self.bids.best()
+
+    def best_ask(self):
+        """
+        Return the best (price, size) of the ask side, or None when it is empty.
+        """
+
+        return self.asks.best()
+
+    def spread(self):
+        """
+        Return the difference between the best ask and the best bid, or NaN when one of the sides is empty.
+        """
+
+        bid = self.bids.best()
+        ask = self.asks.best()
+        return ask[0] - bid[0] if bid and ask else np.nan
+
+    def mid(self):
+        """
+        Return the average between the best ask and the best bid, or NaN when one of the sides is empty.
+        """
+
+        bid = self.bids.best()
+        ask = self.asks.best()
+        return (ask[0] + bid[0]) / 2 if bid and ask else np.nan
+
+    def depth(self, levels=5):
+        """
+        Return the best levels of the book as (bid_prices, bid_sizes, ask_prices, ask_sizes).
+        """
+
+        return self.bids.depth(levels) + self.asks.depth(levels)
+
+    def vwap(self, side, size):
+        """
+        Return the average price to trade the size against a side of the book.
+
+        Parameters
+        ----------
+        side : str
+            'ask' to buy the size from the sellers or 'bid' to sell the size to the buyers.
+        size : float
+            Size to trade.
+
+        Returns
+        -------
+        float
+            Average price, or NaN when the side does not have enough size.
+        """
+
+        if side not in ('bid', 'ask'):
+            raise ValueError('Side not supported.  Sides supported: bid, ask.')
+
+        return (self.bids if side == 'bid' else self.asks).vwap(size)
+
+class OrderBooks:
+
+    def __init__(self, capacity=16):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of price levels allocated per side of each book.  Default: 16.
+        """
+
+        self.__capacity = capacity
+        self.__books = {}
+
+    def update(self, quotes):
+        """
+        Update the books with the quotes received in an on_order_book event.
+
+        Parameters
+        ----------
+        quotes : pandas.DataFrame
+            Order book quotes indexed (or with columns) by symbol and settlement.
+        """
+
+        if quotes is None or quotes.empty:
+            return
+
+        if 'symbol' not in quotes.columns:
+            quotes = quotes.reset_index()
+
+        for (symbol, settlement), book_quotes in quotes.groupby(['symbol', 'settlement'], sort=False):
+            self.get_book(symbol, settlement).update(book_quotes)
+
+    def get_book(self, symbol, settlement):
+        """
+        Return the book of a security, creating an empty one if it does not exist.
+        """
+
+        key = (symbol, settlement)
+        if key not in self.__books:
+            self.__books[key] = OrderBook(symbol, settlement, self.__capacity)
+
+        return self.__books[key]
+
+    def remove_book(self, symbol, settlement):
+        """
+        Remove the book of a security (for example, after unsubscribe_order_book).
+        """
+
+        self.__books.pop((symbol, settlement), None)
+
+    def __contains__(self, key):
+
+        return key in self.__books
+
+    def __iter__(self):
+
+        return iter(self.__books.values())
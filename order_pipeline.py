@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import uuid
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+from requests.exceptions import ConnectTimeout
+from .history_bulk import RateLimiter
+
+OrderRequest = namedtuple('OrderRequest', ['side', 'symbol', 'settlement', 'price', 'size', 'key'], defaults=[None])
+OrderResult = namedtuple('OrderResult', ['key', 'request', 'status', 'order_number', 'error', 'latency'])
+
+class OrderPipeline:
+
+    __sides = ['buy', 'sell']
+
+    def __init__(self, orders, broker=None, max_workers=8, requests_per_second=None, retries=0, retry_exceptions=(ConnectTimeout,), backoff=0.5, latency_samples=10000):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        orders : object
+            Orders module of an authenticated client (hb.orders).  Its HTTP session (and its keep-alive
+            connections) is shared by all the requests sent by the pipeline.
+        broker : int, optional
+            Broker ByMA id.  Required when requests_per_second is specified (the budget is shared with the other
+            requests of the same broker).
+        max_workers : int, optional
+            Maximum number of orders sent concurrently.  Default: 8.
+        requests_per_second : float, optional
+            Maximum number of orders per second.  Default: None (no limit).
+        retries : int, optional
+            Number of times an order is sent again when it fails with one of retry_exceptions.  Default: 0.
+            Only retry the errors that are known to happen before the order reaches the broker.
+        retry_exceptions : tuple of type, optional
+            Exceptions that are retried.  Default: (requests.exceptions.ConnectTimeout,), raised when the connection
+            to the broker could not be established, so the order was never sent.  Broader errors (a reset connection
+            or a read timeout) can happen after the broker accepted the order, and retrying them can send it twice.
+        backoff : float, optional
+            Seconds to wait before the first retry.  The wait is doubled on each retry.  Default: 0.5.
+        latency_samples : int, optional
+            Number of submit to acknowledge latencies kept for the percentiles.  Default: 10000.
+        """
+
+        self.__orders = orders
+        self.__max_workers = max_workers
+        self.__limiter = RateLimiter.get_broker_limiter(broker, requests_per_second) if requests_per_second else None
+        self.__retries = retries
+        self.__retry_exceptions = retry_exceptions
+        self.__backoff = backoff
+
+        self.__results = {}
+        self.__in_flight = {}
+        self.__latencies = deque(maxlen=latency_samples)
+        self.__lock = threading.Lock()
+
+    def submit(self, requests):
+        """
+        Send several orders concurrently, yielding an OrderResult as each order is acknowledged or fails.
+
+        An order whose key was already sent successfully (or is being sent) by this pipeline is not sent again:
+        the result of the first submission is yielded with the status 'duplicate'.
+
+        Parameters
+        ----------
+        requests : list of OrderRequest
+            Orders to send.  The orders without key get a random one (returned in the result).
+
+        Returns
+        -------
+        generator of OrderResult
+            key, request, status ('sent', 'failed' or 'duplicate'), order_number (returned by the broker),
+            error (exception of the failed orders) and latency (seconds from the submission to the acknowledge).
+        """
+
+        requests = self.__assign_keys(requests)
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = [executor.submit(self.__send, request) for request in requests]
+
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def submit_all(self, requests):
+        """
+        Send several orders concurrently and return their results in the order of the requests.
+        """
+
+        requests = self.__assign_keys(requests)
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            return list(executor.map(self.__send, requests))
+
+    def get_result(self, key):
+        """
+        Return the result of the order sent with a key, or None if it was not sent successfully.
+        """
+
+        with self.__lock:
+            return self.__results.get(key)
+
+    def get_latency_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Return the submit to acknowledge latency percentiles (in seconds) of the orders sent successfully.
+
+        Returns
+        -------
+        dict
+            Latency of each percentile ('p50', 'p90', 'p99'), and 'count' with the number of samples.
+        """
+
+        with self.__lock:
+            latencies = np.array(self.__latencies)
+
+        result = {'p{}'.format(percentile): float(np.percentile(latencies, percentile)) if len(latencies) else np.nan for percentile in percentiles}
+        result['count'] = len(latencies)
+
+        return result
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __assign_keys(self, requests):
+
+        for request in requests:
+            if request.side not in self.__sides:
+                raise ValueError('Side not supported.  Sides supported: buy, sell.')
+
+        return [request if request.key else request._replace(key=uuid.uuid4().hex) for request in requests]
+
+    def __send(self, request):
+
+        with self.__lock:
+            if request.key in self.__results:
+                return self.__results[request.key]._replace(request=request, status='duplicate', latency=0.0)
+
+            event = self.__in_flight.get(request.key)
+            if event is None:
+                self.__in_flight[request.key] = threading.Event()
+
+        if event is not None:
+            event.wait()
+            with self.__lock:
+                result = self.__results.get(request.key)
+
+            if result:
+                return result._replace(request=request, status='duplicate', latency=0.0)
+
+            return OrderResult(request.key, request, 'duplicate', None, None, 0.0)
+
+        send = self.__orders.send_buy_order if request.side == 'buy' else self.__orders.send_sell_order
+        start = time.perf_counter()
+
+        try:
+            for retry in range(self.__retries + 1):
+                if self.__limiter:
+                    self.__limiter.acquire()
+
+                try:
+                    order_number = send(request.symbol, request.settlement, request.price, request.size)
+                    break
+                except self.__retry_exceptions:
+                    if retry == self.__retries:
+                        raise
+
+                    time.sleep(self.__backoff * (2 ** retry))
+
+            latency = time.perf_counter() - start
+            result = OrderResult(request.key, request, 'sent', order_number, None, latency)
+
+            with self.__lock:
+                self.__results[request.key] = result
+                self.__latencies.append(latency)
+
+            return result
+        except Exception as ex:
+            return OrderResult(request.key, request, 'failed', None, ex, time.perf_counter() - start)
+        finally:
+            with self.__lock:
+                self.__in_flight.pop(request.key).set()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import pandas as pd
+
+class OrderTracker:
+
+    __id_columns = ['order_number', 'order_id']
+    __terminal_statuses = ['executed', 'cancelled', 'rejected', 'expired']
+
+    def __init__(self, get_order_status=None, on_change=None, terminal_statuses=None):
+        """
+        Class constructor.
+
+        The tracker keeps the state of the orders of an account.  It is seeded with one order status request
+        (seed), it marks the open orders of a security as stale when the personal portfolio stream reports
+        a change of that security (on_personal_portfolio), and it only requests the status of the open orders
+        again (refresh).  Once an order reaches a terminal status its state is not changed anymore.
+
+        Parameters
+        ----------
+        get_order_status : function(order_number), optional
+            Function that returns the current status of an order as a dict (or a one row DataFrame) with the
+            same columns used in seed.  Used by refresh.
+        on_change : function(order_number, previous_status, status, order), optional
+            Called when the status of an order changes.  previous_status is None for new orders.
+        terminal_statuses : list of str, optional
+            Statuses that end an order.  Default: executed, cancelled, rejected and expired.
+        """
+
+        self.__get_order_status = get_order_status
+        self.__on_change = on_change
+        self.__terminal_statuses = set(terminal_statuses or self.__terminal_statuses)
+
+        self.__orders = {}
+        self.__open = set()
+        self.__stale = set()
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+
+        return len(self.__orders)
+
+    def seed(self, orders):
+        """
+        Load the orders of the account.
+
+        Parameters
+        ----------
+        orders : pandas.DataFrame
+            Orders returned by hb.orders.get_orders_status or SHDA.get_order_history.  It must have an order_number
+            (or order_id) column, a status column and, to relate the orders to the personal portfolio, a symbol column.
+        """
+
+        if orders is None or orders.empty:
+            return
+
+        for order in orders.to_dict('records'):
+            self.update(order)
+
+    def update(self, order):
+        """
+        Update the state of an order.
+
+        Parameters
+        ----------
+        order : dict
+            Order with an order_number (or order_id) and a status.
+
+        Returns
+        -------
+        bool
+            True if the status of the order changed.
+        """
+
+        order_number = self.__get_order_number(order)
+        status = order.get('status')
+
+        with self.__lock:
+            current = self.__orders.get(order_number)
+            previous_status = current.get('status') if current else None
+
+            # The terminal statuses are final, so an older answer cannot reopen the order
+            if previous_status in self.__terminal_statuses:
+                return False
+
+            self.__orders[order_number] = dict(current or {}, **order)
+            self.__stale.discard(order_number)
+
+            if status in self.__terminal_statuses:
+                self.__open.discard(order_number)
+            else:
+                self.__open.add(order_number)
+
+            changed = status != previous_status
+            order = dict(self.__orders[order_number])
+
+        if changed and self.__on_change:
+            self.__on_change(order_number, previous_status, status, order)
+
+        return changed
+
+    def refresh(self, stale_only=False):
+        """
+        Request the status of the open orders again (only the orders marked as stale if stale_only is True).
+
+        Returns
+        -------
+        list
+            Order numbers whose status changed.
+        """
+
+        if not self.__get_order_status:
+            raise ValueError('A get_order_status function is required to refresh the orders.')
+
+        with self.__lock:
+            order_numbers = list(self.__stale if stale_only else self.__open)
+
+        changed = []
+        for order_number in order_numbers:
+            order = self.__get_order_status(order_number)
+            if isinstance(order, pd.DataFrame):
+                order = order.to_dict('records')[0] if not order.empty else None
+
+            if order is not None and self.update(dict(order, **{self.__get_order_number_column(order): order_number})):
+                changed.append(order_number)
+
+        return changed
+
+    def get_order(self, order_number):
+        """
+        Return the last known state of an order as a dict, or None if the order is not tracked.
+        """
+
+        with self.__lock:
+            order = self.__orders.get(order_number)
+            return dict(order) if order else None
+
+    def get_orders(self, status=None):
+        """
+        Return the tracked orders (optionally only the orders with a status) as a DataFrame.
+        """
+
+        with self.__lock:
+            orders = [order for order in self.__orders.values() if status is None or order.get('status') == status]
+
+        return pd.DataFrame(orders)
+
+    def get_open_orders(self):
+        """
+        Return the orders that did not reach a terminal status as a DataFrame.
+        """
+
+        with self.__lock:
+            orders = [self.__orders[order_number] for order_number in self.__open]
+
+        return pd.DataFrame(orders)
+
+    def get_stale_orders(self):
+        """
+        Return the order numbers of the open orders whose security changed in the personal portfolio since their last update.
+        """
+
+        with self.__lock:
+            return list(self.__stale)
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_personal_portfolio(self, online, portfolio_quotes, order_book_quotes):
+
+        if portfolio_quotes is None or portfolio_quotes.empty:
+            return
+
+        symbols = set(portfolio_quotes.index.get_level_values('symbol') if 'symbol' in portfolio_quotes.index.names else portfolio_quotes['symbol'])
+
+        with self.__lock:
+            for order_number in self.__open:
+                if self.__orders[order_number].get('symbol') in symbols:
+                    self.__stale.add(order_number)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_order_number_column(self, order):
+
+        for column in self.__id_columns:
+            if column in order:
+                return column
+
+        return self.__id_columns[0]
+
+    def __get_order_number(self, order):
+
+        column = self.__get_order_number_column(order)
+        if column not in order:
+            raise ValueError('The order does not have an order_number or order_id.')
+
+        return order[column]
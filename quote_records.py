@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+try:
+    from .numeric_conversion import to_float, to_board, to_epoch_ns
+except ImportError:
+    # Imported as a top level module (as the benchmarks do)
+    from numeric_conversion import to_float, to_board, to_epoch_ns
+
+quote_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group', 'expiration', 'strike', 'kind', 'underlying_asset']
+
+quote_dtype = np.dtype([
+    ('symbol', 'U24'), ('settlement', 'U4'),
+    ('bid_size', '<f8'), ('bid', '<f8'), ('ask', '<f8'), ('ask_size', '<f8'),
+    ('last', '<f8'), ('change', '<f8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('previous_close', '<f8'),
+    ('turnover', '<f8'), ('volume', '<f8'), ('operations', '<f8'),
+    ('datetime', '<M8[ns]'), ('group', 'U28'),
+    ('expiration', '<M8[ns]'), ('strike', '<f8'), ('kind', 'U4'), ('underlying_asset', 'U24')])
+
+_settlements = {'1': 'spot', '2': '24hs', '3': '48hs'}
+_call_put = {1: 'CALL', 2: 'PUT'}
+_numeric_fields = [
+    ('BuyQuantity', 'bid_size'), ('BuyPrice', 'bid'), ('SellPrice', 'ask'), ('SellQuantity', 'ask_size'),
+    ('LastPrice', 'last'), ('VariationRate', 'change'), ('StartPrice', 'open'), ('MaxPrice', 'high'), ('MinPrice', 'low'),
+    ('PreviousClose', 'previous_close'), ('TotalAmountTraded', 'turnover'), ('TotalQuantityTraded', 'volume'),
+    ('Trades', 'operations'), ('StrikePrice', 'strike')]
+
+_string_fields = [('Symbol', 'symbol'), ('UnderlyingAsset', 'underlying_asset')]
+
+class Quote:
+
+    __slots__ = quote_columns
+
+    def __init__(self, **values):
+
+        for column in quote_columns:
+            setattr(self, column, values.get(column))
+
+    def __repr__(self):
+
+        return 'Quote({})'.format(', '.join('{}={!r}'.format(column, getattr(self, column)) for column in quote_columns))
+
+    def to_dict(self):
+
+        return {column: getattr(self, column) for column in quote_columns}
+
+def process_quotes_records(data, settlement=None):
+    """
+    Convert the quotes of an online message to a NumPy structured array, without creating a DataFrame.
+
+    Parameters
+    ----------
+    data : list of dict
+        Quotes received in the message (Symbol, Term, BuyQuantity, BuyPrice, ..., and the options fields
+        MaturityDate, StrikePrice, OptionType and UnderlyingAsset).
+    settlement : str, optional
+        Settlement of all the quotes.  Default: None (taken from the Term of each quote).
+
+    Returns
+    -------
+    numpy.ndarray
+        Records with the quote_dtype fields.  The missing values are NaN, NaT or empty strings.  The symbol and
+        underlying_asset fields are widened when a value does not fit in quote_dtype, so it is never truncated.
+    """
+
+    size = len(data)
+    records = np.zeros(size, dtype=_get_dtype(data))
+    dates_cache = {}
+
+    # Each field is built as a column and assigned at once, writing the records field by field is much slower
+    records['symbol'] = [quote.get('Symbol') or '' for quote in data]
+    records['settlement'] = settlement or [_settlements.get(str(quote.get('Term')), '') for quote in data]
+    records['group'] = [to_board(quote.get('Panel')) for quote in data]
+
+    for source, target in _numeric_fields:
+        records[target] = np.fromiter((to_float(quote.get(source)) for quote in data), dtype=np.float64, count=size)
+
+    records['datetime'] = np.fromiter((to_epoch_ns(quote.get('TradeDate'), quote.get('Hour'), dates_cache) for quote in data), dtype=np.int64, count=size).view('<M8[ns]')
+    records['expiration'] = np.fromiter((to_epoch_ns(quote.get('MaturityDate'), '00:00:00', dates_cache) for quote in data), dtype=np.int64, count=size).view('<M8[ns]')
+    records['kind'] = [_call_put.get(quote.get('OptionType'), '') for quote in data]
+    records['underlying_asset'] = [quote.get('UnderlyingAsset') or '' for quote in data]
+
+    return records
+
+def records_to_quotes(records):
+    """
+    Convert the records returned by process_quotes_records to a list of Quote objects.
+    """
+
+    columns = [(records[column].astype('<M8[us]') if records.dtype[column].kind == 'M' else records[column]).tolist() for column in quote_columns]
+    return [Quote(**dict(zip(quote_columns, values))) for values in zip(*columns)]
+
+def records_to_frame(records, columns=None):
+    """
+    Convert the records returned by process_quotes_records to a DataFrame indexed by symbol and settlement.
+
+    Parameters
+    ----------
+    records : numpy.ndarray
+        Quote records.
+    columns : list of str, optional
+        Columns to include.  Default: all the columns.
+    """
+
+    import pandas as pd
+
+    columns = columns or [column for column in quote_columns if column not in ('symbol', 'settlement')]
+    df = pd.DataFrame({column: records[column] for column in ['symbol', 'settlement'] + columns})
+
+    return df.set_index(['symbol', 'settlement'])
+
+def _get_dtype(data):
+
+    widths = {}
+    for source, target in _string_fields:
+        width = max((len(quote.get(source) or '') for quote in data), default=0)
+        if width > quote_dtype[target].itemsize // np.dtype('U1').itemsize:
+            widths[target] = width
+
+    if not widths:
+        return quote_dtype
+
+    return np.dtype([(name, 'U{}'.format(widths[name]) if name in widths else quote_dtype[name]) for name in quote_dtype.names])
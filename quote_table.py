@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import numpy as np
+import pandas as pd
+
+class QuoteSnapshot:
+
+    def __init__(self, version, keys, columns):
+        """
+        Class constructor.  The snapshots are created by QuoteTable.snapshot.
+
+        Parameters
+        ----------
+        version : int
+            Version of the quote table when the snapshot was taken.
+        keys : list of tuple
+            (symbol, settlement) of each row.
+        columns : dict of numpy.ndarray
+            Read-only column arrays (one value per row).
+        """
+
+        self.version = version
+        self.__keys = keys
+        self.__columns = columns
+        self.__rows = None
+
+    def __len__(self):
+
+        return len(self.__keys)
+
+    def __contains__(self, key):
+
+        return key in self.__get_rows()
+
+    @property
+    def columns(self):
+
+        return list(self.__columns)
+
+    def get_column(self, column):
+        """
+        Return the read-only array of a column (one value per row, in the order of get_keys).
+        """
+
+        return self.__columns[column]
+
+    def get_keys(self):
+        """
+        Return the (symbol, settlement) of each row.
+        """
+
+        return list(self.__keys)
+
+    def get_quote(self, symbol, settlement):
+        """
+        Return the quote of a security as a dict, or None if the security is not in the snapshot.
+        """
+
+        row = self.__get_rows().get((symbol, settlement))
+        if row is None:
+            return None
+
+        return {column: values[row] for column, values in self.__columns.items()}
+
+    def to_frame(self, kind=None):
+        """
+        Return the snapshot as a DataFrame indexed by symbol and settlement.
+
+        Parameters
+        ----------
+        kind : str, optional
+            Only return the quotes of a kind (securities, options, repos, portfolio or the market snapshot board).
+        """
+
+        index = pd.MultiIndex.from_tuples(self.__keys, names=['symbol', 'settlement']) if self.__keys else pd.MultiIndex.from_arrays([[], []], names=['symbol', 'settlement'])
+        df = pd.DataFrame({column: values for column, values in self.__columns.items()}, index=index)
+
+        if kind is not None:
+            df = df[df['kind'] == kind]
+
+        return df
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_rows(self):
+
+        if self.__rows is None:
+            self.__rows = {key: row for row, key in enumerate(self.__keys)}
+
+        return self.__rows
+
+class QuoteTable:
+
+    def __init__(self, capacity=1024):
+        """
+        Class constructor.
+
+        The table keeps the latest quote of each (symbol, settlement) received from the online module
+        in column arrays that are updated in place.  The readers get consistent snapshots with snapshot():
+        the snapshots share the arrays of the table, and the table only copies them on the first update
+        after a snapshot was taken (copy-on-write), so many readers do not hold a copy each.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of rows allocated.  Default: 1024.
+        """
+
+        self.__capacity = capacity
+        self.__keys = []
+        self.__rows = {}
+        self.__columns = {'kind': np.empty(capacity, dtype=object)}
+
+        self.__version = 0
+        self.__shared = False
+        self.__snapshot = None
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+
+        return len(self.__keys)
+
+    @property
+    def version(self):
+
+        return self.__version
+
+    def update(self, quotes, kind):
+        """
+        Update the table with the quotes received.
+
+        Parameters
+        ----------
+        quotes : pandas.DataFrame
+            Quotes indexed (or with columns) by symbol and settlement.  The columns that are not in the table are added.
+        kind : str
+            Kind of the quotes (securities, options, repos, portfolio or the market snapshot board).
+        """
+
+        if quotes is None or quotes.empty:
+            return
+
+        if 'symbol' in quotes.columns:
+            quotes = quotes.set_index(['symbol', 'settlement'])
+
+        keys = quotes.index.tolist()
+        arrays = {column: quotes[column].to_numpy() for column in quotes.columns}
+
+        with self.__lock:
+            self.__unshare()
+
+            rows = np.empty(len(keys), dtype=np.int64)
+            for i, key in enumerate(keys):
+                row = self.__rows.get(key)
+                if row is None:
+                    row = self.__add_row(key)
+
+                rows[i] = row
+
+            self.__columns['kind'][rows] = kind
+            for column, values in arrays.items():
+                if column not in self.__columns:
+                    self.__add_column(column, values.dtype)
+                elif self.__columns[column].dtype != object and values.dtype == object:
+                    self.__columns[column] = self.__to_object(self.__columns[column])
+
+                if self.__columns[column].dtype == object and values.dtype.kind == 'M':
+                    values = self.__to_object(values)
+
+                self.__columns[column][rows] = values
+
+            self.__version += 1
+
+    def update_market_snapshot(self, snapshot):
+        """
+        Update the table with the DataFrames returned by online.get_market_snapshot (one per board).
+        """
+
+        for board, quotes in snapshot.items():
+            self.update(quotes, board)
+
+    def snapshot(self):
+        """
+        Return a consistent read-only snapshot of the table.
+
+        The snapshot is shared by all the readers of the same version and it is not modified by the next updates.
+        """
+
+        with self.__lock:
+            if self.__snapshot is None or self.__snapshot.version != self.__version:
+                count = len(self.__keys)
+                columns = {}
+                for column, values in self.__columns.items():
+                    values = values[:count]
+                    values.flags.writeable = False
+                    columns[column] = values
+
+                self.__snapshot = QuoteSnapshot(self.__version, tuple(self.__keys), columns)
+                self.__shared = True
+
+            return self.__snapshot
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_securities(self, online, quotes):
+
+        self.update(quotes, 'securities')
+
+    def on_options(self, online, quotes):
+
+        self.update(quotes, 'options')
+
+    def on_repos(self, online, quotes):
+
+        self.update(quotes, 'repos')
+
+    def on_personal_portfolio(self, online, portfolio_quotes, order_book_quotes):
+
+        self.update(portfolio_quotes, 'portfolio')
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __unshare(self):
+
+        if not self.__shared:
+            return
+
+        self.__columns = {column: values.copy() for column, values in self.__columns.items()}
+        self.__shared = False
+
+    def __add_row(self, key):
+
+        row = len(self.__keys)
+        if row == self.__capacity:
+            self.__capacity *= 2
+            for column, values in self.__columns.items():
+                grown = self.__empty_column(values.dtype, self.__capacity)
+                grown[:row] = values[:row]
+                self.__columns[column] = grown
+
+        self.__columns['kind'][row] = None
+        for column, values in self.__columns.items():
+            if column != 'kind':
+                values[row] = self.__empty_value(values.dtype)
+
+        self.__keys.append(key)
+        self.__rows[key] = row
+
+        return row
+
+    def __add_column(self, column, dtype):
+
+        if np.dtype(dtype).kind == 'M':
+            dtype = np.dtype('datetime64[ns]')
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            dtype = np.dtype(np.float64)
+        else:
+            dtype = np.dtype(object)
+
+        self.__columns[column] = self.__empty_column(dtype, self.__capacity)
+
+    def __empty_column(self, dtype, capacity):
+
+        return np.full(capacity, self.__empty_value(dtype), dtype=dtype)
+
+    def __empty_value(self, dtype):
+
+        if dtype == np.float64:
+            return np.nan
+
+        if dtype.kind == 'M':
+            return np.datetime64('NaT', 'ns')
+
+        return None
+
+    def __to_object(self, values):
+
+        # numpy converts datetime64[ns] to object as integer nanoseconds, pandas converts them to Timestamp
+        if values.dtype.kind == 'M':
+            return pd.Series(values).astype(object).to_numpy(copy=True)
+
+        return values.astype(object)
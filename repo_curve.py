@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+import threading
+import numpy as np
+import pandas as pd
+
+class RepoCurveSide:
+
+    def __init__(self, max_days):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        max_days : int
+            Last tenor (in days) of the interpolated curve.
+        """
+
+        self.__days = []
+        self.__rates = {}
+        self.__curve = np.full(max_days + 1, np.nan)
+
+    def __len__(self):
+
+        return len(self.__days)
+
+    def set_rate(self, days, rate):
+        """
+        Set the rate of a tenor and interpolate the curve between its neighbour tenors.  A NaN rate removes the tenor.
+        """
+
+        days = int(days)
+        if days >= len(self.__curve):
+            self.__resize(days)
+
+        position = bisect.bisect_left(self.__days, days)
+        exists = position < len(self.__days) and self.__days[position] == days
+
+        if np.isnan(rate):
+            if not exists:
+                return
+
+            del self.__days[position]
+            del self.__rates[days]
+        else:
+            if not exists:
+                self.__days.insert(position, days)
+
+            self.__rates[days] = float(rate)
+
+        self.__interpolate(position)
+
+    def get_rate(self, days):
+        """
+        Return the interpolated rate of a tenor (flat beyond the first and last tenors).
+        """
+
+        days = int(days)
+        curve = self.__curve
+        return curve[days] if 0 <= days < len(curve) else curve[-1] if days >= 0 else np.nan
+
+    def get_tenors(self):
+        """
+        Return the tenors and rates received as (days, rates) arrays.
+        """
+
+        return np.array(self.__days, dtype=np.int64), np.array([self.__rates[days] for days in self.__days], dtype=np.float64)
+
+    def get_curve(self):
+        """
+        Return a read-only view of the interpolated rates (one per day, from day 0 to max_days).
+        """
+
+        curve = self.__curve.view()
+        curve.flags.writeable = False
+        return curve
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __interpolate(self, position):
+
+        # The tenor changed at position only affects the curve between the previous and the next tenors
+        if not self.__days:
+            self.__curve[:] = np.nan
+            return
+
+        first = max(position - 1, 0)
+        last = min(position + 1, len(self.__days) - 1)
+
+        start = self.__days[first] if first > 0 or position > 0 else 0
+        end = self.__days[last] + 1 if last < len(self.__days) - 1 else len(self.__curve)
+
+        days = self.__days[first:last + 1]
+        rates = [self.__rates[day] for day in days]
+        self.__curve[start:end] = np.interp(np.arange(start, end), days, rates)
+
+    def __resize(self, days):
+
+        curve = np.empty(max(days + 1, 2 * len(self.__curve)))
+        curve[:len(self.__curve)] = self.__curve
+        curve[len(self.__curve):] = self.__curve[-1]
+        self.__curve = curve
+
+class RepoCurve:
+
+    __sides = ['bid', 'ask', 'mid', 'last']
+
+    def __init__(self, symbol, max_days=365):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol of the repos (currency).
+        max_days : int, optional
+            Last tenor (in days) of the interpolated curve.  It grows when a longer tenor is received.  Default: 365.
+        """
+
+        self.symbol = symbol
+        self.__curves = {side: RepoCurveSide(max_days) for side in self.__sides}
+        self.__tenors = {}
+
+    def set_tenor(self, days, bid_rate, ask_rate, last=np.nan, bid_amount=np.nan, ask_amount=np.nan):
+        """
+        Set the rates of a tenor.  The mid rate is only set when both bid and ask rates are available.
+        """
+
+        mid = (bid_rate + ask_rate) / 2
+        for side, rate in zip(self.__sides, [bid_rate, ask_rate, mid, last]):
+            self.__curves[side].set_rate(days, rate)
+
+        self.__tenors[int(days)] = (bid_rate, ask_rate, last, bid_amount, ask_amount)
+
+    def get_rate(self, days, side='mid'):
+        """
+        Return the interpolated rate (as quoted by the broker) of a tenor in constant time.
+
+        Parameters
+        ----------
+        days : int
+            Tenor in days.
+        side : str, optional
+            Rate to return (bid, ask, mid or last).  Default: mid.
+        """
+
+        if side not in self.__curves:
+            raise ValueError('Side not supported.  Sides supported: bid, ask, mid, last.')
+
+        return self.__curves[side].get_rate(days)
+
+    def get_curve(self, side='mid'):
+        """
+        Return a read-only array with the interpolated rate of each day, from day 0 to max_days.
+        """
+
+        if side not in self.__curves:
+            raise ValueError('Side not supported.  Sides supported: bid, ask, mid, last.')
+
+        return self.__curves[side].get_curve()
+
+    def get_tenors(self):
+        """
+        Return the tenors received as a DataFrame with the columns days, bid_rate, ask_rate, last, bid_amount and ask_amount.
+        """
+
+        days = sorted(self.__tenors)
+        df = pd.DataFrame([self.__tenors[day] for day in days], columns=['bid_rate', 'ask_rate', 'last', 'bid_amount', 'ask_amount'], dtype=np.float64)
+        df.insert(0, 'days', days)
+
+        return df
+
+class RepoCurves:
+
+    def __init__(self, max_days=365):
+        """
+        Class constructor.
+
+        The curves are updated with the repos quotes received by on_repos (one curve per repos symbol).
+
+        Parameters
+        ----------
+        max_days : int, optional
+            Last tenor (in days) of the interpolated curves.  Default: 365.
+        """
+
+        self.__max_days = max_days
+        self.__curves = {}
+        self.__lock = threading.Lock()
+
+    def update(self, quotes):
+        """
+        Update the curves with the repos quotes (columns symbol, days, bid_rate, ask_rate, last, bid_amount and ask_amount).
+        """
+
+        if quotes is None or quotes.empty:
+            return
+
+        if 'symbol' not in quotes.columns:
+            quotes = quotes.reset_index()
+
+        columns = [quotes[column].to_numpy(dtype=np.float64) if column in quotes.columns else np.full(len(quotes), np.nan) for column in ['days', 'bid_rate', 'ask_rate', 'last', 'bid_amount', 'ask_amount']]
+
+        with self.__lock:
+            for symbol, days, bid_rate, ask_rate, last, bid_amount, ask_amount in zip(quotes['symbol'], *columns):
+                if np.isnan(days):
+                    continue
+
+                self.get_curve(symbol).set_tenor(days, bid_rate, ask_rate, last, bid_amount, ask_amount)
+
+    def get_curve(self, symbol):
+        """
+        Return the curve of a repos symbol, creating an empty one if it does not exist.
+        """
+
+        curve = self.__curves.get(symbol)
+        if curve is None:
+            curve = self.__curves[symbol] = RepoCurve(symbol, self.__max_days)
+
+        return curve
+
+    def get_rate(self, symbol, days, side='mid'):
+        """
+        Return the interpolated rate of a tenor of a repos symbol, or NaN if there are no quotes for the symbol.
+        """
+
+        curve = self.__curves.get(symbol)
+        return curve.get_rate(days, side) if curve else np.nan
+
+    def __contains__(self, symbol):
+
+        return symbol in self.__curves
+
+    ##############################
+    #### HOMEBROKER CALLBACKS ####
+    ##############################
+    def on_repos(self, online, quotes):
+
+        self.update(quotes)
@@ -51,12 +51,12 @@ setup(
         'Topic :: Software Development :: Libraries :: Python Modules',
 
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ],
     platforms=['any'],
     keywords='pandas, homebroker, online, historical, downloader, finance',
     packages=find_packages(exclude=['contrib', 'docs', 'tests', 'examples']),
-    install_requires=['pandas>=1.0.0', 'numpy>=1.18.1', 'requests>=2.21.0', 'signalr-client-threads>=0.0.12', 'pyquery>=1.2']
+    install_requires=['pandas>=1.0.0', 'numpy>=1.18.1', 'requests>=2.21.0', 'signalr-client-threads>=0.0.12', 'pyquery>=1.2'],
+    extras_require={'async': ['aiohttp>=3.7'], 'cache': ['cryptography>=3.0']}
 )
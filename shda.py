@@ -1,1333 +1,149 @@
-from os import path
-import re
-import json
-import datetime
 import requests
-import numpy as np
-import pandas as pd
-from pyquery import PyQuery as pq
-from common import brokers, BrokerNotSupportedException, convert_to_numeric_columns, SessionException
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from shda_core import SHDACore
+from common import SessionException
 
-class SHDA:
-    __settlements_int_map = {
-        '1': 'spot',
-        '2': '24hs',
-        '3': '48hs'}
+class SHDA(SHDACore):
+    __max_workers = 18
 
-    __personal_portfolio_index = ['symbol', 'settlement']
-    __personal_portfolio_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'expiration', 'strike', 'kind', 'underlying_asset', 'close']
-    __empty_personal_portfolio = pd.DataFrame(columns=__personal_portfolio_columns).set_index(__personal_portfolio_index)
+    def __init__(self,broker,dni,user,password,session_cache=None,order_history_index=None):
+        super().__init__(broker, order_history_index)
 
-    __repos_index = ['symbol', 'settlement']
-    __repos_columns = ['symbol', 'days', 'settlement', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'close']
-    __empty_repos = pd.DataFrame(columns=__repos_columns).set_index(__repos_index)
-
-    __call_put_map = {
-            0: '',
-            1: 'CALL',
-            2: 'PUT'}
-    __boards = {
-            0:"",
-            'accionesLideres':'bluechips',
-            'panelGeneral':'general_board',
-            'cedears': 'cedears',
-            'rentaFija':'government_bonds',
-            'letes':'short_term_government_bonds',
-            'obligaciones':'corporate_bonds'}
-
-    __settlements_map = {'':0,'spot': 1,'24hs': 2,'48hs': 3}
-    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
-    __filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
-    __numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
-    __numeric_columns_sp = ['last', 'high', 'low','change']
-    __filter_columns_sp = ['Symbol', 'LastPrice', 'VariationRate', 'MaxPrice', 'MinPrice', 'Panel']
-    __sp_columns=['symbol','last','change','high','low','group']
-    
-    def __init__(self,broker,dni,user,password):
         self.__s = requests.session()
-        self.__host = self.__get_broker_data(broker)['page']
+        self.__s.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=self.__max_workers))
         self.__is_user_logged_in = False
 
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",    
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "none",
-            "Sec-Fetch-User" : "?1"   
-        }
-
-        response = self.__s.get(url = f"https://{self.__host}", headers=headers)
-        status = response.status_code
-        if status != 200:
-          print("Server Down", status)  
-          exit()
-
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "Content-Type" : "application/x-www-form-urlencoded",
-            "Origin" : f"https://{self.__host}/",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",
-            "Referer" : f"https://{self.__host}/",
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "same-origin",
-            "Sec-Fetch-User" : "?1",
-            "TE" : "trailers"
-        }
+        self.__broker = broker
+        self.__dni = dni
+        self.__user = user
+        self.__password = password
+        self.__session_cache = session_cache
+        self.__session_id = 0
+        self.__login_lock = threading.Lock()
 
-        data = {
-            "IpAddress": "",
-            "Dni": dni,
-            "Usuario": user,
-            "Password": password
-        }  
-
-        try:
-            response = self.__s.post(url = f"https://{self.__host}/Login/Ingresar", headers=headers, data = data, allow_redirects=True)
-
-            response.raise_for_status()
-
-            doc = pq(response.text)
-            if not doc('#usuarioLogueado'):
-                print("Check login credentials")
-                errormsg = doc('.callout-danger')
-                if errormsg:
-                    raise SessionException(errormsg.text())
-
-                raise SessionException('Session cannot be created.  Check the entered information and try again.')
+        cookies = session_cache.load(broker, dni, user, password) if session_cache else None
+        if cookies:
+            for cookie in cookies:
+                self.__s.cookies.set(**cookie)
 
             print("Connected!")
             self.__is_user_logged_in = True
-        except Exception as ex:
-            self.__is_user_logged_in = False
-            exit()
-
-    def get_bluechips(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+        else:
+            self.__login()
 
-        data = '{"panel":"accionesLideres","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+    def get_board(self, board, settlement):
+        return self.__get_panel(self.get_board_panel(board), settlement)
 
-    def get_galpones(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"panelGeneral","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+    def get_boards(self, boards=None, settlements=None, as_frame=True):
+        requests_args = self.get_boards_panels(boards, settlements)
+        if not requests_args:
+            return self.process_boards([]) if as_frame else self.process_boards_arrays([])
 
-    def get_cedear(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+        with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(requests_args))) as executor:
+            responses = list(executor.map(lambda args: self.__get_panel_data(*args), requests_args))
 
-        data = '{"panel":"cedears","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+        if not as_frame:
+            return self.process_boards_arrays([self.process_panel_arrays(data, settlement) for (panel, settlement), data in zip(requests_args, responses)])
 
-    def get_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+        return self.process_boards([self.process_panel(data, settlement) for (panel, settlement), data in zip(requests_args, responses)])
 
-        data = '{"panel":"rentaFija","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+    def poll_boards(self, boards=None, settlements=None):
+        requests_args = self.get_boards_panels(boards, settlements)
+        if not requests_args:
+            return self.process_boards([])
 
-    def get_short_term_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+        with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(requests_args))) as executor:
+            dfs = list(executor.map(lambda args: self.process_poll(*args, self.__get_panel(*args)), requests_args))
 
-        data = '{"panel":"letes","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+        return self.process_boards(dfs)
 
-    def get_corporate_bonds(self,settlement):
+    def get_order_history(self, comitente):
         if not self.__is_user_logged_in:
             print('You must be logged first')
             exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-           from os import path
-import re
-import json
-import datetime
-import requests
-import numpy as np
-import pandas as pd
-from pyquery import PyQuery as pq
-from common import brokers, BrokerNotSupportedException, convert_to_numeric_columns, SessionException
-
-class SHDA:
-    __settlements_int_map = {
-        '1': 'spot',
-        '2': '24hs',
-        '3': '48hs'}
-
-    __personal_portfolio_index = ['symbol', 'settlement']
-    __personal_portfolio_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'expiration', 'strike', 'kind', 'underlying_asset', 'close']
-    __empty_personal_portfolio = pd.DataFrame(columns=__personal_portfolio_columns).set_index(__personal_portfolio_index)
-
-    __repos_index = ['symbol', 'settlement']
-    __repos_columns = ['symbol', 'days', 'settlement', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'close']
-    __empty_repos = pd.DataFrame(columns=__repos_columns).set_index(__repos_index)
-
-    __call_put_map = {
-            0: '',
-            1: 'CALL',
-            2: 'PUT'}
-    __boards = {
-            0:"",
-            'accionesLideres':'bluechips',
-            'panelGeneral':'general_board',
-            'cedears': 'cedears',
-            'rentaFija':'government_bonds',
-            'letes':'short_term_government_bonds',
-            'obligaciones':'corporate_bonds'}
 
-    __settlements_map = {'':0,'spot': 1,'24hs': 2,'48hs': 3}
-    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
-    __filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
-    __numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
-    __numeric_columns_sp = ['last', 'high', 'low','change']
-    __filter_columns_sp = ['Symbol', 'LastPrice', 'VariationRate', 'MaxPrice', 'MinPrice', 'Panel']
-    __sp_columns=['symbol','last','change','high','low','group']
-    
-    def __init__(self,broker,dni,user,password):
-        self.__s = requests.session()
-        self.__host = self.__get_broker_data(broker)['page']
-        self.__is_user_logged_in = False
-
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",    
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "none",
-            "Sec-Fetch-User" : "?1"   
-        }
-
-        response = self.__s.get(url = f"https://{self.__host}", headers=headers)
-        status = response.status_code
-        if status != 200:
-          print("Server Down", status)  
-          exit()
-
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "Content-Type" : "application/x-www-form-urlencoded",
-            "Origin" : f"https://{self.__host}/",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",
-            "Referer" : f"https://{self.__host}/",
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "same-origin",
-            "Sec-Fetch-User" : "?1",
-            "TE" : "trailers"
-        }
-
-        data = {
-            "IpAddress": "",
-            "Dni": dni,
-            "Usuario": user,
-            "Password": password
-        }  
-
-        try:
-            response = self.__s.post(url = f"https://{self.__host}/Login/Ingresar", headers=headers, data = data, allow_redirects=True)
-
-            response.raise_for_status()
-
-            doc = pq(response.text)
-            if not doc('#usuarioLogueado'):
-                print("Check login credentials")
-                errormsg = doc('.callout-danger')
-                if errormsg:
-                    raise SessionException(errormsg.text())
-
-                raise SessionException('Session cannot be created.  Check the entered information and try again.')
-
-            print("Connected!")
-            self.__is_user_logged_in = True
-        except Exception as ex:
-            self.__is_user_logged_in = False
-            exit()
-
-    def get_bluechips(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"accionesLideres","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_galpones(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"panelGeneral","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_cedear(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"cedears","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"rentaFija","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_short_term_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"letes","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_corporate_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-           from os import path
-import re
-import json
-import datetime
-import requests
-import numpy as np
-import pandas as pd
-from pyquery import PyQuery as pq
-from common import brokers, BrokerNotSupportedException, convert_to_numeric_columns, SessionException
+        return self.process_order_history(self.__post_json('/Orders/GetOrderHistory', self.get_order_history_headers(), self.get_order_history_data(comitente), 'GetOrderHistory'))
 
-class SHDA:
-    __settlements_int_map = {
-        '1': 'spot',
-        '2': '24hs',
-        '3': '48hs'}
+    def sync_order_history(self, comitente):
+        return self.process_order_history_sync(comitente, self.get_order_history(comitente))
 
-    __personal_portfolio_index = ['symbol', 'settlement']
-    __personal_portfolio_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'expiration', 'strike', 'kind', 'underlying_asset', 'close']
-    __empty_personal_portfolio = pd.DataFrame(columns=__personal_portfolio_columns).set_index(__personal_portfolio_index)
+    def account(self, comitente):
+        return self.process_account(self.__get_holdings_data(comitente))
 
-    __repos_index = ['symbol', 'settlement']
-    __repos_columns = ['symbol', 'days', 'settlement', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'close']
-    __empty_repos = pd.DataFrame(columns=__repos_columns).set_index(__repos_index)
+    def get_holdings(self, comitente):
+        return self.process_holdings(self.__get_holdings_data(comitente))
 
-    __call_put_map = {
-            0: '',
-            1: 'CALL',
-            2: 'PUT'}
-    __boards = {
-            0:"",
-            'accionesLideres':'bluechips',
-            'panelGeneral':'general_board',
-            'cedears': 'cedears',
-            'rentaFija':'government_bonds',
-            'letes':'short_term_government_bonds',
-            'obligaciones':'corporate_bonds'}
-
-    __settlements_map = {'':0,'spot': 1,'24hs': 2,'48hs': 3}
-    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
-    __filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
-    __numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
-    __numeric_columns_sp = ['last', 'high', 'low','change']
-    __filter_columns_sp = ['Symbol', 'LastPrice', 'VariationRate', 'MaxPrice', 'MinPrice', 'Panel']
-    __sp_columns=['symbol','last','change','high','low','group']
-    
-    def __init__(self,broker,dni,user,password):
-        self.__s = requests.session()
-        self.__host = self.__get_broker_data(broker)['page']
-        self.__is_user_logged_in = False
-
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",    
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "none",
-            "Sec-Fetch-User" : "?1"   
-        }
-
-        response = self.__s.get(url = f"https://{self.__host}", headers=headers)
-        status = response.status_code
-        if status != 200:
-          print("Server Down", status)  
-          exit()
-
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "Content-Type" : "application/x-www-form-urlencoded",
-            "Origin" : f"https://{self.__host}/",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",
-            "Referer" : f"https://{self.__host}/",
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "same-origin",
-            "Sec-Fetch-User" : "?1",
-            "TE" : "trailers"
-        }
-
-        data = {
-            "IpAddress": "",
-            "Dni": dni,
-            "Usuario": user,
-            "Password": password
-        }  
-
-        try:
-            response = self.__s.post(url = f"https://{self.__host}/Login/Ingresar", headers=headers, data = data, allow_redirects=True)
-
-            response.raise_for_status()
-
-            doc = pq(response.text)
-            if not doc('#usuarioLogueado'):
-                print("Check login credentials")
-                errormsg = doc('.callout-danger')
-                if errormsg:
-                    raise SessionException(errormsg.text())
-
-                raise SessionException('Session cannot be created.  Check the entered information and try again.')
-
-            print("Connected!")
-            self.__is_user_logged_in = True
-        except Exception as ex:
-            self.__is_user_logged_in = False
-            exit()
-
-    def get_bluechips(self,settlement):
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_holdings_data(self, comitente):
         if not self.__is_user_logged_in:
             print('You must be logged first')
             exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
 
-        data = '{"panel":"accionesLideres","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+        return self.__post_json('/Consultas/GetConsulta', self.get_holdings_headers(), self.get_holdings_data(comitente), 'GetConsulta')
 
-    def get_galpones(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"panelGeneral","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+    def __get_panel(self, panel, settlement):
+        return self.process_panel(self.__get_panel_data(panel, settlement), settlement)
 
-    def get_cedear(self,settlement):
+    def __get_panel_data(self, panel, settlement):
         if not self.__is_user_logged_in:
             print('You must be logged first')
             exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
 
-        data = '{"panel":"cedears","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+        return self.__post_json('/Prices/GetByPanel', self.get_panel_headers(), self.get_panel_data(panel, settlement), 'GetByPanel')
 
-    def get_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+    def __post_json(self, path, headers, data, name):
+        session_id = self.__session_id
+        response = self.__s.post(url = f"https://{self.host}{path}", headers=headers, data = data)
 
-        data = '{"panel":"rentaFija","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
+        if self.is_session_expired(response.status_code, response.headers.get('Content-Type', ''), response.url):
+            self.__relogin(session_id)
+            response = self.__s.post(url = f"https://{self.host}{path}", headers=headers, data = data)
 
-    def get_short_term_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
+            if self.is_session_expired(response.status_code, response.headers.get('Content-Type', ''), response.url):
+                raise SessionException('Session expired and it could not be restored.')
 
-        data = '{"panel":"letes","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
         status = response.status_code
         if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_corporate_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
+            print(name, status)
             exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-           from os import path
-import re
-import json
-import datetime
-import requests
-import numpy as np
-import pandas as pd
-from pyquery import PyQuery as pq
-from common import brokers, BrokerNotSupportedException, convert_to_numeric_columns, SessionException
-
-class SHDA:
-    __settlements_int_map = {
-        '1': 'spot',
-        '2': '24hs',
-        '3': '48hs'}
-
-    __personal_portfolio_index = ['symbol', 'settlement']
-    __personal_portfolio_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'expiration', 'strike', 'kind', 'underlying_asset', 'close']
-    __empty_personal_portfolio = pd.DataFrame(columns=__personal_portfolio_columns).set_index(__personal_portfolio_index)
-
-    __repos_index = ['symbol', 'settlement']
-    __repos_columns = ['symbol', 'days', 'settlement', 'bid_amount', 'bid_rate', 'ask_rate', 'ask_amount', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'close']
-    __empty_repos = pd.DataFrame(columns=__repos_columns).set_index(__repos_index)
-
-    __call_put_map = {
-            0: '',
-            1: 'CALL',
-            2: 'PUT'}
-    __boards = {
-            0:"",
-            'accionesLideres':'bluechips',
-            'panelGeneral':'general_board',
-            'cedears': 'cedears',
-            'rentaFija':'government_bonds',
-            'letes':'short_term_government_bonds',
-            'obligaciones':'corporate_bonds'}
-
-    __settlements_map = {'':0,'spot': 1,'24hs': 2,'48hs': 3}
-    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
-    __filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
-    __numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
-    __numeric_columns_sp = ['last', 'high', 'low','change']
-    __filter_columns_sp = ['Symbol', 'LastPrice', 'VariationRate', 'MaxPrice', 'MinPrice', 'Panel']
-    __sp_columns=['symbol','last','change','high','low','group']
-    
-    def __init__(self,broker,dni,user,password):
-        self.__s = requests.session()
-        self.__host = self.__get_broker_data(broker)['page']
-        self.__is_user_logged_in = False
 
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",    
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "none",
-            "Sec-Fetch-User" : "?1"   
-        }
+        return response.json()
 
-        response = self.__s.get(url = f"https://{self.__host}", headers=headers)
+    def __login(self):
+        response = self.__s.get(url = f"https://{self.host}", headers=self.get_landing_headers())
         status = response.status_code
         if status != 200:
-          print("Server Down", status)  
+          print("Server Down", status)
           exit()
 
-        headers = {
-            "Host" : f"{self.__host}",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Accept-Encoding" : "gzip, deflate",
-            "Content-Type" : "application/x-www-form-urlencoded",
-            "Origin" : f"https://{self.__host}/",
-            "DNT" : "1",    
-            "Connection" : "keep-alive",
-            "Referer" : f"https://{self.__host}/",
-            "Upgrade-Insecure-Requests" : "1",
-            "Sec-Fetch-Dest" : "document",
-            "Sec-Fetch-Mode" : "navigate",
-            "Sec-Fetch-Site" : "same-origin",
-            "Sec-Fetch-User" : "?1",
-            "TE" : "trailers"
-        }
-
-        data = {
-            "IpAddress": "",
-            "Dni": dni,
-            "Usuario": user,
-            "Password": password
-        }  
-
         try:
-            response = self.__s.post(url = f"https://{self.__host}/Login/Ingresar", headers=headers, data = data, allow_redirects=True)
+            response = self.__s.post(url = f"https://{self.host}/Login/Ingresar", headers=self.get_login_headers(), data = self.get_login_data(self.__dni, self.__user, self.__password), allow_redirects=True)
 
             response.raise_for_status()
 
-            doc = pq(response.text)
-            if not doc('#usuarioLogueado'):
-                print("Check login credentials")
-                errormsg = doc('.callout-danger')
-                if errormsg:
-                    raise SessionException(errormsg.text())
-
-                raise SessionException('Session cannot be created.  Check the entered information and try again.')
+            self.process_login(response.text)
 
             print("Connected!")
             self.__is_user_logged_in = True
+            self.__session_id += 1
         except Exception as ex:
             self.__is_user_logged_in = False
             exit()
 
-    def get_bluechips(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"accionesLideres","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_galpones(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"panelGeneral","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_cedear(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"cedears","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"rentaFija","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_short_term_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-            "Connection" : "keep-alive",    
-            "Content-Type" : "application/json; charset=utf-8",
-            "DNT" : "1",    
-            "Host" : f"{self.__host}",
-            "Origin" : f"https://{self.__host}",
-            "Referer" : f"https://{self.__host}/Prices/Stocks",
-            "Sec-Fetch-Dest" : "empty",
-            "Sec-Fetch-Mode" : "cors",
-            "Sec-Fetch-Site" : "same-origin",
-            "TE" : "trailers",
-            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With" : "XMLHttpRequest"
-        }
-
-        data = '{"panel":"letes","term":"'+str(self.__settlements_map[settlement])+'"}'
-        response = self.__s.post(url = f"https://{self.__host}/Prices/GetByPanel", headers=headers, data = data)
-        status = response.status_code
-        if status != 200:
-            print("GetByPanel", status)  
-            exit()
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Stocks'])
-        df = pd.DataFrame(data['Result']['Stocks']) if data['Result'] and data['Result']['Stocks'] else pd.DataFrame()
-        df.TradeDate = pd.to_datetime(df.TradeDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[self.__filter_columns].copy()
-        df.columns = self.__securities_columns
-        df = convert_to_numeric_columns(df, self.__numeric_columns)
-        df.group = df.group.apply(lambda x: self.__boards[x] if x in self.__boards else self.__boards[0])
-        df.settlement=settlement 
-        return df
-
-    def get_corporate_bonds(self,settlement):
-        if not self.__is_user_logged_in:
-            print('You must be logged first')
-            exit()
-        headers = {
-            "Accept" : "application/json, text/javascript, */*; q=0.01",
-            "Accept-Encoding" : "gzip, deflate",
-            "Accept-Language" : "en-US,en;q=0.5",
-           
-            "Connection": "keep-alive",
-            "Content-Type": "application/json; charset=utf-8",
-            "DNT": "1",
-            "Host": f"{self.__host}",
-            "Origin": f"https://{self.__host}",
-            "Referer": f"https://{self.__host}/Orders/History",
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-            "TE": "trailers",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
-            "X-Requested-With": "XMLHttpRequest"
-        }
-
-        data = json.dumps({"comitente": str(comitente)})
-        response = self.__s.post(url=f"https://{self.__host}/Orders/GetOrderHistory", headers=headers, data=data)
-        status = response.status_code
-        if status != 200:
-            print("GetOrderHistory", status)
-            exit()
-
-        data = response.json()
-        df = pd.DataFrame(data['Result']['Orders'])
-        df = pd.DataFrame(data['Result']['Orders']) if data['Result'] and data['Result']['Orders'] else pd.DataFrame()
-        df.OrderDate = pd.to_datetime(df.OrderDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
-        df = df[['OrderID', 'Symbol', 'OrderType', 'Quantity', 'Price', 'OrderDate', 'Status']].copy()
-        df.columns = ['order_id', 'symbol', 'order_type', 'quantity', 'price', 'order_date', 'status']
-        df = convert_to_numeric_columns(df, ['quantity', 'price'])
-        return df
-
-    #########################
-    #### PRIVATE METHODS ####
-    #########################
-    def __convert_datetime_to_epoch(self, dt):
-
-        if isinstance(dt, str):
-            dt = datetime.datetime.strptime(dt, '%Y-%m-%d')
-
-        dt_zero = datetime.date(1970, 1, 1)
-        time_delta = dt - dt_zero
-        return int(time_delta.total_seconds())
-    
-    def __get_broker_data(self, broker_id):
-
-        broker_data = [broker for broker in brokers if broker['broker_id'] == broker_id]
+        if self.__session_cache:
+            cookies = [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path} for cookie in self.__s.cookies]
+            self.__session_cache.save(self.__broker, self.__dni, self.__user, self.__password, cookies)
 
-        if not broker_data:
-            supported_brokers = ''.join([str(broker['broker_id']) + ', ' for broker in brokers])[0:-2]
-            raise BrokerNotSupportedException('Broker not supported.  Brokers supported: {}.'.format(supported_brokers))
+    def __relogin(self, session_id):
+        with self.__login_lock:
+            if session_id != self.__session_id:
+                return
 
-        return broker_data[0]
+            if self.__session_cache:
+                self.__session_cache.clear(self.__broker, self.__dni, self.__user)
 
+            self.__s.cookies.clear()
+            self.__login()
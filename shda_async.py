@@ -0,0 +1,159 @@
+import asyncio
+import aiohttp
+from yarl import URL
+from shda_core import SHDACore
+from common import SessionException
+
+class AsyncSHDA(SHDACore):
+    __max_connections = 100
+
+    def __init__(self,broker,dni,user,password,max_connections=None,session_cache=None,order_history_index=None):
+        super().__init__(broker, order_history_index)
+
+        self.__broker = broker
+        self.__dni = dni
+        self.__user = user
+        self.__password = password
+        self.__max_connections = max_connections or self.__max_connections
+        self.__s = None
+        self.__is_user_logged_in = False
+        self.__session_cache = session_cache
+        self.__session_id = 0
+        self.__login_lock = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def login(self):
+        if self.__s is None or self.__s.closed:
+            connector = aiohttp.TCPConnector(limit=self.__max_connections, limit_per_host=self.__max_connections)
+            self.__s = aiohttp.ClientSession(connector=connector)
+
+            # Before Python 3.10 the lock binds to the loop current at creation, so it is created with the session
+            self.__login_lock = asyncio.Lock()
+
+        self.__is_user_logged_in = False
+
+        if self.__session_cache:
+            loop = asyncio.get_running_loop()
+            cookies = await loop.run_in_executor(None, self.__session_cache.load, self.__broker, self.__dni, self.__user, self.__password)
+            if cookies:
+                for cookie in cookies:
+                    self.__s.cookie_jar.update_cookies({cookie['name']: cookie['value']}, URL(f"https://{cookie['domain'] or self.host}{cookie['path'] or '/'}"))
+
+                print("Connected!")
+                self.__is_user_logged_in = True
+                return
+
+        await self.__login()
+
+    async def close(self):
+        if self.__s is not None and not self.__s.closed:
+            await self.__s.close()
+
+        self.__is_user_logged_in = False
+
+    async def get_board(self, board, settlement):
+        return await self.__get_panel(self.get_board_panel(board), settlement)
+
+    async def get_boards(self, boards=None, settlements=None, as_frame=True):
+        requests_args = self.get_boards_panels(boards, settlements)
+        responses = await asyncio.gather(*[self.__get_panel_data(panel, settlement) for panel, settlement in requests_args])
+
+        if not as_frame:
+            return self.process_boards_arrays([self.process_panel_arrays(data, settlement) for (panel, settlement), data in zip(requests_args, responses)])
+
+        return self.process_boards([self.process_panel(data, settlement) for (panel, settlement), data in zip(requests_args, responses)])
+
+    async def poll_boards(self, boards=None, settlements=None):
+        requests_args = self.get_boards_panels(boards, settlements)
+        dfs = await asyncio.gather(*[self.__get_panel(panel, settlement) for panel, settlement in requests_args])
+
+        return self.process_boards([self.process_poll(panel, settlement, df) for (panel, settlement), df in zip(requests_args, dfs)])
+
+    async def get_order_history(self, comitente):
+        if not self.__is_user_logged_in:
+            raise SessionException('You must be logged first.')
+
+        return self.process_order_history(await self.__post_json('/Orders/GetOrderHistory', self.get_order_history_headers(), self.get_order_history_data(comitente), 'GetOrderHistory'))
+
+    async def sync_order_history(self, comitente):
+        df = await self.get_order_history(comitente)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process_order_history_sync, comitente, df)
+
+    async def account(self, comitente):
+        return self.process_account(await self.__get_holdings_data(comitente))
+
+    async def get_holdings(self, comitente):
+        return self.process_holdings(await self.__get_holdings_data(comitente))
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    async def __get_holdings_data(self, comitente):
+        if not self.__is_user_logged_in:
+            raise SessionException('You must be logged first.')
+
+        return await self.__post_json('/Consultas/GetConsulta', self.get_holdings_headers(), self.get_holdings_data(comitente), 'GetConsulta')
+
+    async def __get_panel(self, panel, settlement):
+        return self.process_panel(await self.__get_panel_data(panel, settlement), settlement)
+
+    async def __get_panel_data(self, panel, settlement):
+        if not self.__is_user_logged_in:
+            raise SessionException('You must be logged first.')
+
+        return await self.__post_json('/Prices/GetByPanel', self.get_panel_headers(), self.get_panel_data(panel, settlement), 'GetByPanel')
+
+    async def __post_json(self, path, headers, data, name):
+        session_id = self.__session_id
+
+        for retry in (True, False):
+            async with self.__s.post(url = f"https://{self.host}{path}", headers=headers, data = data) as response:
+                if self.is_session_expired(response.status, response.content_type, str(response.url)):
+                    if not retry:
+                        raise SessionException('Session expired and it could not be restored.')
+                else:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+            await self.__relogin(session_id)
+
+    async def __login(self):
+        async with self.__s.get(url = f"https://{self.host}", headers=self.get_landing_headers()) as response:
+            response.raise_for_status()
+
+        try:
+            async with self.__s.post(url = f"https://{self.host}/Login/Ingresar", headers=self.get_login_headers(), data = self.get_login_data(self.__dni, self.__user, self.__password), allow_redirects=True) as response:
+                response.raise_for_status()
+                html = await response.text()
+
+            self.process_login(html)
+
+            print("Connected!")
+            self.__is_user_logged_in = True
+            self.__session_id += 1
+        except Exception as ex:
+            self.__is_user_logged_in = False
+            raise SessionException('Login failed.') from ex
+
+        if self.__session_cache:
+            cookies = [{'name': cookie.key, 'value': cookie.value, 'domain': cookie['domain'], 'path': cookie['path']} for cookie in self.__s.cookie_jar]
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__session_cache.save, self.__broker, self.__dni, self.__user, self.__password, cookies)
+
+    async def __relogin(self, session_id):
+        async with self.__login_lock:
+            if session_id != self.__session_id:
+                return
+
+            if self.__session_cache:
+                self.__session_cache.clear(self.__broker, self.__dni, self.__user)
+
+            self.__s.cookie_jar.clear()
+            await self.__login()
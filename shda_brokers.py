@@ -0,0 +1,79 @@
+import json
+import threading
+from common import brokers, BrokerNotSupportedException
+
+class BrokerRegistry:
+    def __init__(self, brokers=()):
+        self.__brokers = {}
+        self.__hosts = {}
+        self.__supported_brokers = None
+        self.__lock = threading.Lock()
+
+        for broker in brokers:
+            self.__add(dict(broker))
+
+    def __contains__(self, broker_id):
+        return broker_id in self.__brokers
+
+    def __len__(self):
+        return len(self.__brokers)
+
+    def get(self, broker_id):
+        broker = self.__brokers.get(broker_id)
+        if broker is None:
+            raise BrokerNotSupportedException('Broker not supported.  Brokers supported: {}.'.format(self.get_supported_brokers()))
+
+        return broker
+
+    def get_by_host(self, host):
+        broker = self.__hosts.get(self.__normalize_host(host))
+        if broker is None:
+            raise BrokerNotSupportedException('Host not supported: {}.'.format(host))
+
+        return broker
+
+    def get_supported_brokers(self):
+        supported_brokers = self.__supported_brokers
+        if supported_brokers is None:
+            supported_brokers = self.__supported_brokers = ', '.join(str(broker_id) for broker_id in self.__brokers)
+
+        return supported_brokers
+
+    def register(self, broker_id, page, **metadata):
+        broker = dict(metadata, broker_id=broker_id, page=page)
+
+        with self.__lock:
+            self.__add(broker)
+
+        return broker
+
+    def load(self, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        with self.__lock:
+            for broker in data:
+                self.__add(dict(broker))
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __add(self, broker):
+        previous = self.__brokers.get(broker['broker_id'])
+        if previous is not None:
+            self.__hosts.pop(self.__normalize_host(previous['page']), None)
+
+        broker['page'] = self.__normalize_host(broker['page'])
+        self.__brokers[broker['broker_id']] = broker
+        self.__hosts[broker['page']] = broker
+        self.__supported_brokers = None
+
+    @staticmethod
+    def __normalize_host(host):
+        host = host.lower()
+        if '://' in host:
+            host = host.split('://', 1)[1]
+
+        return host.split('/', 1)[0]
+
+broker_registry = BrokerRegistry(brokers)
@@ -0,0 +1,304 @@
+import json
+import inspect
+from common import SessionException
+from shda_brokers import broker_registry
+from shda_orders import OrderHistoryIndex
+
+class SHDACore:
+    __settlements_int_map = {
+        '1': 'spot',
+        '2': '24hs',
+        '3': '48hs'}
+
+    __boards_panels = {
+            'bluechips':'accionesLideres',
+            'general_board':'panelGeneral',
+            'cedears':'cedears',
+            'government_bonds':'rentaFija',
+            'short_term_government_bonds':'letes',
+            'corporate_bonds':'obligaciones'}
+    __boards_methods = {
+            'get_bluechips':'bluechips',
+            'get_galpones':'general_board',
+            'get_cedear':'cedears',
+            'get_bonds':'government_bonds',
+            'get_short_term_bonds':'short_term_government_bonds',
+            'get_corporate_bonds':'corporate_bonds'}
+
+    __settlements_map = {'':0,'spot': 1,'24hs': 2,'48hs': 3}
+    __securities_index = ['symbol', 'settlement']
+    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
+    __filter_columns = ['Symbol', 'Term', 'BuyQuantity', 'BuyPrice', 'SellPrice', 'SellQuantity', 'LastPrice', 'VariationRate', 'StartPrice', 'MaxPrice', 'MinPrice', 'PreviousClose', 'TotalAmountTraded', 'TotalQuantityTraded', 'Trades', 'TradeDate', 'Panel']
+    __numeric_columns = ['last', 'open', 'high', 'low', 'volume', 'turnover', 'operations', 'change', 'bid_size', 'bid', 'ask_size', 'ask', 'previous_close']
+    __poll_columns = ['last', 'bid', 'ask', 'volume', 'datetime']
+
+    __order_history_filter_columns = ['OrderID', 'Symbol', 'OrderType', 'Quantity', 'Price', 'OrderDate', 'Status']
+    __order_history_columns = ['order_id', 'symbol', 'order_type', 'quantity', 'price', 'order_date', 'status']
+    __order_history_numeric_columns = ['quantity', 'price']
+
+    __holdings_filter_columns = ['TICK', 'CANT', 'PCIO', 'CAN0', 'CAN2', 'CAN3']
+    __holdings_columns = ['symbol', 'quantity', 'price', 'can0', 'can2', 'can3']
+    __holdings_numeric_columns = ['quantity', 'price', 'can0', 'can2', 'can3']
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        is_async = inspect.iscoroutinefunction(cls.get_board)
+        for method, board in SHDACore.__boards_methods.items():
+            setattr(cls, method, SHDACore.__create_board_method(method, board, is_async))
+
+    def __init__(self, broker, order_history_index=None):
+        self.__host = self.__get_broker_data(broker)['page']
+        self.__poll_state = {}
+        self.__order_history_index = order_history_index or OrderHistoryIndex(persist=False)
+
+    @property
+    def host(self):
+        return self.__host
+
+    ##########################
+    #### REQUEST BUILDERS ####
+    ##########################
+    def get_landing_headers(self):
+        return {
+            "Host" : f"{self.__host}",
+            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
+            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language" : "en-US,en;q=0.5",
+            "Accept-Encoding" : "gzip, deflate",
+            "DNT" : "1",
+            "Connection" : "keep-alive",
+            "Upgrade-Insecure-Requests" : "1",
+            "Sec-Fetch-Dest" : "document",
+            "Sec-Fetch-Mode" : "navigate",
+            "Sec-Fetch-Site" : "none",
+            "Sec-Fetch-User" : "?1"
+        }
+
+    def get_login_headers(self):
+        return {
+            "Host" : f"{self.__host}",
+            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
+            "Accept" : "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language" : "en-US,en;q=0.5",
+            "Accept-Encoding" : "gzip, deflate",
+            "Content-Type" : "application/x-www-form-urlencoded",
+            "Origin" : f"https://{self.__host}/",
+            "DNT" : "1",
+            "Connection" : "keep-alive",
+            "Referer" : f"https://{self.__host}/",
+            "Upgrade-Insecure-Requests" : "1",
+            "Sec-Fetch-Dest" : "document",
+            "Sec-Fetch-Mode" : "navigate",
+            "Sec-Fetch-Site" : "same-origin",
+            "Sec-Fetch-User" : "?1",
+            "TE" : "trailers"
+        }
+
+    def get_login_data(self, dni, user, password):
+        return {
+            "IpAddress": "",
+            "Dni": dni,
+            "Usuario": user,
+            "Password": password
+        }
+
+    def get_json_headers(self, referer):
+        return {
+            "Accept" : "application/json, text/javascript, */*; q=0.01",
+            "Accept-Encoding" : "gzip, deflate",
+            "Accept-Language" : "en-US,en;q=0.5",
+            "Connection" : "keep-alive",
+            "Content-Type" : "application/json; charset=utf-8",
+            "DNT" : "1",
+            "Host" : f"{self.__host}",
+            "Origin" : f"https://{self.__host}",
+            "Referer" : f"https://{self.__host}{referer}",
+            "Sec-Fetch-Dest" : "empty",
+            "Sec-Fetch-Mode" : "cors",
+            "Sec-Fetch-Site" : "same-origin",
+            "TE" : "trailers",
+            "User-Agent" : "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0",
+            "X-Requested-With" : "XMLHttpRequest"
+        }
+
+    def get_panel_headers(self):
+        return self.get_json_headers('/Prices/Stocks')
+
+    def get_board_panel(self, board):
+        if board not in self.__boards_panels:
+            raise ValueError('Board not supported.  Boards supported: {}.'.format(', '.join(self.__boards_panels)))
+
+        return self.__boards_panels[board]
+
+    def get_panel_data(self, panel, settlement):
+        return '{"panel":"'+panel+'","term":"'+str(self.__settlements_map[settlement])+'"}'
+
+    def get_boards_panels(self, boards=None, settlements=None):
+        boards = boards if boards is not None else self.__boards_panels.keys()
+        settlements = settlements if settlements is not None else self.__settlements_int_map.values()
+
+        return [(self.get_board_panel(board), settlement) for board in boards for settlement in settlements]
+
+    def get_order_history_headers(self):
+        return self.get_json_headers('/Orders/History')
+
+    def get_order_history_data(self, comitente):
+        return json.dumps({"comitente": str(comitente)})
+
+    def get_holdings_headers(self):
+        return self.get_json_headers('/Consultas/Tenencia')
+
+    def get_holdings_data(self, comitente):
+        return json.dumps({"comitente": str(comitente), "consolida": "0", "proceso": "22", "fechaDesde": None, "fechaHasta": None, "tipo": None, "especie": None, "comitenteMana": None})
+
+    ##########################
+    #### RESPONSE PARSERS ####
+    ##########################
+    def process_login(self, html):
+        from pyquery import PyQuery as pq
+
+        doc = pq(html)
+        if not doc('#usuarioLogueado'):
+            print("Check login credentials")
+            errormsg = doc('.callout-danger')
+            if errormsg:
+                raise SessionException(errormsg.text())
+
+            raise SessionException('Session cannot be created.  Check the entered information and try again.')
+
+    def is_session_expired(self, status, content_type, url):
+        return status in (401, 403) or '/Login' in url or (status == 200 and 'json' not in content_type)
+
+    def process_panel(self, data, settlement):
+        import pandas as pd
+
+        return pd.DataFrame(self.process_panel_arrays(data, settlement), columns=self.__securities_columns)
+
+    def process_panel_arrays(self, data, settlement):
+        import numpy as np
+        from numeric_conversion import to_float, to_board, to_epoch_ns
+
+        stocks = data['Result']['Stocks'] if data['Result'] and data['Result']['Stocks'] else []
+        size = len(stocks)
+
+        arrays = {}
+        numeric = []
+        objects = []
+        for source, target in zip(self.__filter_columns, self.__securities_columns):
+            if target in self.__numeric_columns:
+                arrays[target] = np.empty(size, dtype=np.float64)
+                numeric.append((source, arrays[target]))
+            elif target not in ('settlement', 'datetime'):
+                arrays[target] = np.empty(size, dtype=object)
+                objects.append((source, arrays[target]))
+
+        dates = np.empty(size, dtype=np.int64)
+        dates_cache = {}
+        for i, stock in enumerate(stocks):
+            for source, array in numeric:
+                array[i] = to_float(stock.get(source))
+            for source, array in objects:
+                array[i] = stock.get(source)
+            dates[i] = to_epoch_ns(stock.get('TradeDate'), stock.get('Hour'), dates_cache)
+
+        arrays['settlement'] = np.full(size, settlement, dtype=object)
+        arrays['datetime'] = dates.view('datetime64[ns]')
+
+        panels, inverse = np.unique(arrays['group'].astype(str), return_inverse=True)
+        groups = np.array([to_board(panel) for panel in panels], dtype=object)
+        arrays['group'] = groups[inverse.reshape(-1)]
+
+        return {column: arrays[column] for column in self.__securities_columns}
+
+    def process_boards(self, dfs):
+        import pandas as pd
+
+        if not dfs:
+            return pd.DataFrame(columns=self.__securities_columns)
+
+        return pd.concat(dfs, ignore_index=True)
+
+    def process_boards_arrays(self, boards_arrays):
+        import numpy as np
+
+        if not boards_arrays:
+            return self.process_panel_arrays({'Result': None}, '')
+
+        return {column: np.concatenate([arrays[column] for arrays in boards_arrays]) for column in self.__securities_columns}
+
+    def process_poll(self, panel, settlement, df):
+        current = df.set_index(self.__securities_index)[self.__poll_columns]
+        previous = self.__poll_state.get((panel, settlement))
+        self.__poll_state[(panel, settlement)] = current[~current.index.duplicated(keep='last')]
+
+        if previous is None:
+            return df
+
+        previous = previous.reindex(current.index)
+        changed = (current.ne(previous) & ~(current.isna() & previous.isna())).any(axis=1)
+        return df[changed.values]
+
+    def reset_poll(self):
+        self.__poll_state = {}
+
+    def process_order_history(self, data):
+        import pandas as pd
+        from numeric_conversion import convert_to_numeric_columns
+
+        if not data['Result'] or not data['Result']['Orders']:
+            df = pd.DataFrame(columns=self.__order_history_columns)
+            return df.astype(dict({column: 'float64' for column in self.__order_history_numeric_columns}, order_date='datetime64[ns]'))
+
+        df = pd.DataFrame(data['Result']['Orders'])
+        df.OrderDate = pd.to_datetime(df.OrderDate, format='%Y%m%d', errors='coerce') + pd.to_timedelta(df.Hour, errors='coerce')
+        df = df[self.__order_history_filter_columns].copy()
+        df.columns = self.__order_history_columns
+        df = convert_to_numeric_columns(df, self.__order_history_numeric_columns)
+        return df
+
+    def process_account(self, data):
+        activos = data['Result']['Activos'] if data['Result'] and data['Result'].get('Activos') else []
+
+        return [item for activo in activos for item in (activo.get('Subtotal') or [activo])]
+
+    def process_holdings(self, data):
+        import pandas as pd
+        from numeric_conversion import convert_to_numeric_columns
+
+        df = pd.DataFrame(self.process_account(data), columns=self.__holdings_filter_columns)
+        df.columns = self.__holdings_columns
+        df = convert_to_numeric_columns(df, self.__holdings_numeric_columns)
+        df = df[df.symbol.notna().to_numpy() & df[self.__holdings_numeric_columns].notna().all(axis=1).to_numpy()]
+        return df.drop_duplicates().reset_index(drop=True)
+
+    def process_order_history_sync(self, comitente, df):
+        return self.__order_history_index.merge(comitente, df)
+
+    def get_indexed_orders(self, comitente, status=None):
+        return self.__order_history_index.get_orders(comitente, status)
+
+    def get_executed_orders(self, comitente):
+        return self.__order_history_index.get_orders(comitente, 'executed')
+
+    def get_order_history_last_seen(self, comitente):
+        return self.__order_history_index.get_last_seen(comitente)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    @staticmethod
+    def __create_board_method(name, board, is_async):
+        if is_async:
+            async def get_board(self, settlement):
+                return await self.get_board(board, settlement)
+        else:
+            def get_board(self, settlement):
+                return self.get_board(board, settlement)
+
+        get_board.__name__ = name
+        get_board.__qualname__ = name
+        return get_board
+
+    def __get_broker_data(self, broker_id):
+        return broker_registry.get(broker_id)
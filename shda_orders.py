@@ -0,0 +1,126 @@
+import os
+import json
+import threading
+
+class OrderHistoryIndex:
+    __columns = ['order_id', 'symbol', 'order_type', 'quantity', 'price', 'order_date', 'status']
+
+    def __init__(self, folder=None, persist=True):
+        self.__folder = folder or os.path.join(os.path.expanduser('~'), '.shda', 'orders')
+        self.__persist = persist
+        self.__orders = {}
+        self.__last_seen = {}
+        self.__lock = threading.Lock()
+
+    def merge(self, comitente, df):
+        records = [self.__to_record(values) for values in df[self.__columns].itertuples(index=False, name=None)]
+
+        with self.__lock:
+            orders = self.__load(comitente)
+            changed = [record for record in records if orders.get(record['order_id']) != record]
+            if not changed:
+                return self.__to_frame([])
+
+            if self.__persist:
+                os.makedirs(self.__folder, mode=0o700, exist_ok=True)
+                fd = os.open(self.__get_filename(comitente), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                with os.fdopen(fd, 'a') as f:
+                    f.write(''.join(json.dumps(record) + '\n' for record in changed))
+
+            for record in changed:
+                self.__add(comitente, orders, record)
+
+        return self.__to_frame(changed)
+
+    def get_orders(self, comitente, status=None):
+        with self.__lock:
+            orders = self.__load(comitente)
+            return self.__to_frame([record for record in orders.values() if status is None or record['status'] == status])
+
+    def get_last_seen(self, comitente):
+        with self.__lock:
+            self.__load(comitente)
+            return self.__last_seen.get(str(comitente))
+
+    def compact(self, comitente):
+        if not self.__persist:
+            return
+
+        with self.__lock:
+            orders = self.__load(comitente)
+            filename = self.__get_filename(comitente)
+            temp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+            fd = os.open(temp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(''.join(json.dumps(record) + '\n' for record in orders.values()))
+
+            os.replace(temp_filename, filename)
+
+    def clear(self, comitente):
+        with self.__lock:
+            self.__orders.pop(str(comitente), None)
+            self.__last_seen.pop(str(comitente), None)
+
+            try:
+                os.remove(self.__get_filename(comitente))
+            except FileNotFoundError:
+                pass
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __load(self, comitente):
+        comitente = str(comitente)
+        if comitente in self.__orders:
+            return self.__orders[comitente]
+
+        orders = self.__orders[comitente] = {}
+        if self.__persist:
+            try:
+                with open(self.__get_filename(comitente), 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            self.__add(comitente, orders, json.loads(line))
+            except FileNotFoundError:
+                pass
+
+        return orders
+
+    def __add(self, comitente, orders, record):
+        comitente = str(comitente)
+
+        # The log is append-only, so the last record of an order is its current state
+        orders.pop(record['order_id'], None)
+        orders[record['order_id']] = record
+
+        last_seen = self.__last_seen.get(comitente)
+        if record['order_date'] and (last_seen is None or record['order_date'] >= last_seen['order_date']):
+            self.__last_seen[comitente] = {'order_id': record['order_id'], 'order_date': record['order_date']}
+
+    def __to_record(self, values):
+        import pandas as pd
+
+        record = {}
+        for column, value in zip(self.__columns, values):
+            if column == 'order_date':
+                value = None if pd.isna(value) else pd.Timestamp(value).isoformat()
+            elif value is not None and not isinstance(value, str) and pd.isna(value):
+                value = None
+            elif hasattr(value, 'item'):
+                value = value.item()
+
+            record[column] = value
+
+        return record
+
+    def __to_frame(self, records):
+        import pandas as pd
+
+        df = pd.DataFrame(records, columns=self.__columns)
+        df['order_date'] = pd.to_datetime(df['order_date'])
+        df['quantity'] = df['quantity'].astype('float64')
+        df['price'] = df['price'].astype('float64')
+        return df
+
+    def __get_filename(self, comitente):
+        return os.path.join(self.__folder, '{}.orders'.format(comitente))
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import base64
+import hashlib
+from cryptography.fernet import Fernet, InvalidToken
+
+class SessionCache:
+    __magic = b'SHDA1'
+    __salt_size = 16
+    __iterations = 200000
+
+    def __init__(self, folder=None, max_age=12 * 60 * 60):
+        self.__folder = folder or os.path.join(os.path.expanduser('~'), '.shda', 'sessions')
+        self.__max_age = max_age
+
+    def load(self, broker, dni, user, password):
+        filename = self.__get_filename(broker, dni, user)
+
+        try:
+            with open(filename, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        if not content.startswith(self.__magic):
+            return None
+
+        salt = content[len(self.__magic):len(self.__magic) + self.__salt_size]
+        token = content[len(self.__magic) + self.__salt_size:]
+
+        try:
+            data = json.loads(self.__get_fernet(broker, dni, user, password, salt).decrypt(token, ttl=self.__max_age))
+        except (InvalidToken, ValueError):
+            return None
+
+        return data['cookies']
+
+    def save(self, broker, dni, user, password, cookies):
+        os.makedirs(self.__folder, mode=0o700, exist_ok=True)
+
+        salt = os.urandom(self.__salt_size)
+        data = json.dumps({'saved': int(time.time()), 'cookies': cookies}).encode('utf-8')
+        token = self.__get_fernet(broker, dni, user, password, salt).encrypt(data)
+
+        filename = self.__get_filename(broker, dni, user)
+        temp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        fd = os.open(temp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.__magic + salt + token)
+
+        os.replace(temp_filename, filename)
+
+    def clear(self, broker, dni, user):
+        try:
+            os.remove(self.__get_filename(broker, dni, user))
+        except FileNotFoundError:
+            pass
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __get_filename(self, broker, dni, user):
+        name = hashlib.sha256('{}:{}:{}'.format(broker, dni, user).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.__folder, '{}.session'.format(name))
+
+    def __get_fernet(self, broker, dni, user, password, salt):
+        secret = '{}:{}:{}:{}'.format(broker, dni, user, password).encode('utf-8')
+        key = hashlib.pbkdf2_hmac('sha256', secret, salt, self.__iterations, dklen=32)
+        return Fernet(base64.urlsafe_b64encode(key))
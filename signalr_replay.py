@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gzip
+import json
+import time
+import struct
+import threading
+import numpy as np
+
+class SignalRRecorder:
+
+    __magic = b'SHSR1'
+    __header = struct.Struct('<dIB')
+
+    __frame_bytes = 0
+    __frame_text = 1
+    __frame_json = 2
+    __frame_call = 3
+
+    def __init__(self, filename, compress=True):
+        """
+        Class constructor.
+
+        The frames are saved as records of timestamp (float64), length (uint32), type (uint8) and payload.
+
+        Parameters
+        ----------
+        filename : str
+            File where the frames are recorded.
+        compress : bool, optional
+            Compress the file with gzip.  Default: True.
+        """
+
+        self.__file = (gzip.open if compress else open)(filename, 'wb')
+        self.__file.write(self.__magic)
+        self.__lock = threading.Lock()
+        self.__count = 0
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    def __len__(self):
+
+        return self.__count
+
+    def record(self, frame, timestamp=None):
+        """
+        Record an inbound frame.
+
+        Parameters
+        ----------
+        frame : bytes, str, dict or list
+            Frame received.  The dicts and lists (frames already decoded by the SignalR client) are saved as JSON.
+        timestamp : float, optional
+            Time when the frame was received.  Default: time.time().
+        """
+
+        if isinstance(frame, bytes):
+            frame_type, payload = self.__frame_bytes, frame
+        elif isinstance(frame, str):
+            frame_type, payload = self.__frame_text, frame.encode('utf-8')
+        else:
+            frame_type, payload = self.__frame_json, json.dumps(frame, separators=(',', ':')).encode('utf-8')
+
+        self.__write(frame_type, payload, timestamp)
+
+    def record_call(self, args, kwargs, timestamp=None):
+        """
+        Record a call to the message handler, with its positional and keyword arguments, so it is replayed
+        with the same arguments.
+
+        Parameters
+        ----------
+        args : tuple
+            Positional arguments of the call.
+        kwargs : dict
+            Keyword arguments of the call.
+        timestamp : float, optional
+            Time when the call was received.  Default: time.time().
+        """
+
+        payload = json.dumps({'args': list(args), 'kwargs': kwargs}, separators=(',', ':')).encode('utf-8')
+        self.__write(self.__frame_call, payload, timestamp)
+
+    def wrap(self, handler):
+        """
+        Return a handler that records the call received (record_call) and then calls the original handler.
+
+        It is used to record the frames of the message handler registered in the SignalR client.
+        """
+
+        def recording_handler(*args, **kwargs):
+            self.record_call(args, kwargs)
+            return handler(*args, **kwargs)
+
+        return recording_handler
+
+    def close(self):
+
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.close()
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __write(self, frame_type, payload, timestamp):
+
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self.__lock:
+            self.__file.write(self.__header.pack(timestamp, len(payload), frame_type))
+            self.__file.write(payload)
+            self.__count += 1
+
+class SignalRReplayer:
+
+    __magic = b'SHSR1'
+    __header = struct.Struct('<dIB')
+
+    __frame_text = 1
+    __frame_json = 2
+    __frame_call = 3
+
+    def __init__(self, filename):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        filename : str
+            File created by SignalRRecorder (compressed or not).
+        """
+
+        self.__filename = filename
+
+    def frames(self):
+        """
+        Yield the (timestamp, frame) recorded, in the order they were received.
+
+        The calls recorded by SignalRRecorder.wrap are yielded as their first positional argument, or as their
+        keyword arguments when the call had no positional arguments.  Use calls to get the complete calls.
+        """
+
+        for timestamp, args, kwargs, is_call in self.__read():
+            yield timestamp, args[0] if args or not is_call else kwargs
+
+    def calls(self):
+        """
+        Yield the (timestamp, args, kwargs) recorded, in the order they were received.  The frames recorded with
+        SignalRRecorder.record are yielded as a call with the frame as the only positional argument.
+        """
+
+        for timestamp, args, kwargs, _ in self.__read():
+            yield timestamp, args, kwargs
+
+    def __read(self):
+
+        with self.__open() as f:
+            if f.read(len(self.__magic)) != self.__magic:
+                raise ValueError('Invalid SignalR recording file.')
+
+            while True:
+                header = f.read(self.__header.size)
+                if len(header) < self.__header.size:
+                    return
+
+                timestamp, length, frame_type = self.__header.unpack(header)
+                payload = f.read(length)
+
+                if frame_type == self.__frame_call:
+                    call = json.loads(payload)
+                    yield timestamp, tuple(call['args']), call['kwargs'], True
+                elif frame_type == self.__frame_text:
+                    yield timestamp, (payload.decode('utf-8'),), {}, False
+                elif frame_type == self.__frame_json:
+                    yield timestamp, (json.loads(payload),), {}, False
+                else:
+                    yield timestamp, (payload,), {}, False
+
+    def replay(self, handler, speed=1.0, as_kwargs=False):
+        """
+        Push the recorded frames through a handler (the message handler of the online module).
+
+        Parameters
+        ----------
+        handler : function(frame)
+            Function called with each frame.  The calls recorded by SignalRRecorder.wrap are replayed with their
+            original positional and keyword arguments.
+        speed : float, optional
+            Replay speed relative to the recording (2 replays twice as fast).  None replays as fast as possible.  Default: 1.
+        as_kwargs : bool, optional
+            Call the handler with the dict frames recorded with SignalRRecorder.record as keyword arguments
+            (handler(**frame)).  It does not apply to the recorded calls.  Default: False.
+
+        Returns
+        -------
+        dict
+            messages: frames replayed, elapsed: seconds, messages_per_second, and latency_p50, latency_p90,
+            latency_p99 and latency_max: seconds spent in the handler per frame.
+        """
+
+        latencies = []
+        start = time.perf_counter()
+        first_timestamp = None
+
+        for timestamp, args, kwargs, is_call in self.__read():
+            if speed:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+
+                wait = (timestamp - first_timestamp) / speed - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+
+            call_start = time.perf_counter()
+            if as_kwargs and not is_call and isinstance(args[0], dict):
+                handler(**args[0])
+            else:
+                handler(*args, **kwargs)
+            latencies.append(time.perf_counter() - call_start)
+
+        elapsed = time.perf_counter() - start
+        messages = len(latencies)
+        latencies = np.array(latencies) if latencies else np.zeros(1)
+
+        return {
+            'messages': messages,
+            'elapsed': elapsed,
+            'messages_per_second': messages / elapsed if elapsed else 0.0,
+            'latency_p50': float(np.percentile(latencies, 50)),
+            'latency_p90': float(np.percentile(latencies, 90)),
+            'latency_p99': float(np.percentile(latencies, 99)),
+            'latency_max': float(latencies.max()) }
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __open(self):
+
+        with open(self.__filename, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+
+        return gzip.open(self.__filename, 'rb') if compressed else open(self.__filename, 'rb')
@@ -0,0 +1,48 @@
+import time
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from history_cache import HistoryCache
+
+def make_history(from_date, to_date):
+    dates = pd.date_range(from_date, to_date, freq='D')
+    return pd.DataFrame({'date': dates, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 100.0})
+
+def test_symbols_are_downloaded_concurrently(tmp_path):
+    downloading = []
+    overlap = threading.Event()
+    lock = threading.Lock()
+
+    def get_daily_history(symbol, from_date, to_date):
+        with lock:
+            downloading.append(symbol)
+            if len(downloading) > 1:
+                overlap.set()
+
+        overlap.wait(5)
+        with lock:
+            downloading.remove(symbol)
+
+        return make_history(from_date, to_date)
+
+    cache = HistoryCache(str(tmp_path), get_daily_history)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda symbol: cache.get_daily_history(symbol, '2025-01-01', '2025-01-10'), ['GGAL', 'YPFD']))
+
+    assert overlap.is_set()
+    assert [len(df) for df in results] == [10, 10]
+
+def test_cached_dates_are_not_downloaded_again(tmp_path):
+    calls = []
+
+    def get_daily_history(symbol, from_date, to_date):
+        calls.append((from_date, to_date))
+        return make_history(from_date, to_date)
+
+    cache = HistoryCache(str(tmp_path), get_daily_history)
+    cache.get_daily_history('GGAL', '2025-01-01', '2025-01-10')
+    df = cache.get_daily_history('GGAL', '2025-01-05', '2025-01-15')
+
+    assert len(calls) == 2
+    assert str(calls[1][0]) == '2025-01-11'
+    assert len(df) == 11
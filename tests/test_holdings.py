@@ -0,0 +1,25 @@
+import pandas as pd
+from holdings import Holdings
+
+def make_portfolio(quotes):
+    return pd.DataFrame(quotes, columns=['symbol', 'settlement', 'last']).set_index(['symbol', 'settlement'])
+
+def make_holdings():
+    return Holdings(pd.DataFrame({'symbol': ['GGAL', 'YPFD'], 'quantity': [10.0, 2.0], 'price': [100.0, 500.0]}))
+
+def test_prices_of_other_settlements_are_ignored():
+    holdings = make_holdings()
+
+    holdings.on_personal_portfolio(None, make_portfolio([('GGAL', 'spot', 90.0), ('GGAL', '48hs', 110.0)]), None)
+    holdings.on_personal_portfolio(None, make_portfolio([('GGAL', 'spot', 95.0)]), None)
+
+    assert holdings.get_value() == 10 * 110.0 + 2 * 500.0
+
+def test_value_is_updated_incrementally():
+    holdings = make_holdings()
+
+    holdings.on_personal_portfolio(None, make_portfolio([('YPFD', '48hs', 600.0), ('PAMP', '48hs', 1.0)]), None)
+    holdings.set_position('GGAL', 0)
+
+    assert holdings.get_value() == 2 * 600.0
+    assert holdings.get_positions().set_index('symbol').loc['YPFD', 'weight'] == 1.0
@@ -0,0 +1,22 @@
+import os
+import sys
+import subprocess
+import numpy as np
+import pandas as pd
+from numeric_conversion import convert_to_numeric_columns, to_float
+
+def test_import_does_not_load_pandas():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = 'import sys, numeric_conversion; print("pandas" in sys.modules)'
+
+    assert subprocess.check_output([sys.executable, '-c', code], cwd=root).decode().strip() == 'False'
+
+def test_locale_values_are_converted():
+    df = pd.DataFrame({'last': ['1.234,50', '-', None], 'volume': [1, 2, 3]})
+
+    df = convert_to_numeric_columns(df, ['last', 'volume'])
+
+    assert to_float('1.234,5') == 1234.5
+    assert df['last'].iloc[0] == 1234.5
+    assert np.isnan(df['last'].iloc[1]) and np.isnan(df['last'].iloc[2])
+    assert df['volume'].dtype == np.float64
@@ -0,0 +1,72 @@
+import threading
+import pandas as pd
+from online_dispatcher import OnlineDispatcher
+
+def make_quotes(symbol, last):
+    return pd.DataFrame({'symbol': [symbol], 'settlement': ['48hs'], 'last': [last]}).set_index(['symbol', 'settlement'])
+
+def make_book(symbol, levels, price=100.0):
+    return pd.DataFrame({
+        'symbol': symbol, 'settlement': '48hs', 'position': range(1, levels + 1),
+        'bid': [price - level for level in range(levels)], 'ask': [price + level for level in range(levels)]}).set_index(['symbol', 'settlement'])
+
+def collect(**kwargs):
+    batches = []
+    delivered = threading.Event()
+
+    def on_personal_portfolio(online, portfolio_quotes, order_book_quotes):
+        batches.append(order_book_quotes)
+        delivered.set()
+
+    def on_securities(online, quotes):
+        batches.append(quotes)
+        delivered.set()
+
+    return OnlineDispatcher(on_securities=on_securities, on_personal_portfolio=on_personal_portfolio, **kwargs), batches, delivered
+
+def test_securities_are_coalesced_by_index():
+    dispatcher, batches, delivered = collect(interval=60, batch_size=3)
+
+    with dispatcher:
+        for last in [1, 2, 3]:
+            dispatcher.on_securities(None, make_quotes('GGAL', last))
+        assert delivered.wait(5)
+
+    assert batches[0]['last'].tolist() == [3]
+    assert dispatcher.get_metrics()['coalesced'] == 2
+
+def test_order_book_keeps_all_the_levels():
+    dispatcher, batches, delivered = collect(interval=60, batch_size=5)
+
+    with dispatcher:
+        dispatcher.on_personal_portfolio(None, None, make_book('GGAL', 5))
+        assert delivered.wait(5)
+
+    assert batches[0]['position'].tolist() == [1, 2, 3, 4, 5]
+    assert dispatcher.get_metrics()['coalesced'] == 0
+
+def test_order_book_keeps_the_latest_full_book():
+    dispatcher, batches, delivered = collect(interval=60, batch_size=11)
+
+    with dispatcher:
+        dispatcher.on_personal_portfolio(None, None, make_book('GGAL', 5))
+        dispatcher.on_personal_portfolio(None, None, make_book('YPFD', 3))
+        dispatcher.on_personal_portfolio(None, None, make_book('GGAL', 3, price=200.0))
+        assert delivered.wait(5)
+
+    book = batches[0]
+    assert book.loc['GGAL']['position'].tolist() == [1, 2, 3]
+    assert book.loc['GGAL']['bid'].tolist() == [200.0, 199.0, 198.0]
+    assert book.loc['YPFD']['position'].tolist() == [1, 2, 3]
+    assert dispatcher.get_metrics()['coalesced'] == 5
+
+def test_full_queue_drops_the_oldest_quotes():
+    dispatcher, batches, delivered = collect(interval=60, batch_size=100, max_pending=2)
+
+    dispatcher.start()
+    for symbol in ['GGAL', 'YPFD', 'PAMP']:
+        dispatcher.on_securities(None, make_quotes(symbol, 1))
+    dispatcher.stop()
+
+    assert batches[0].index.get_level_values('symbol').tolist() == ['YPFD', 'PAMP']
+    assert dispatcher.get_metrics()['dropped'] == 1
@@ -0,0 +1,75 @@
+import time
+from online_reconnect import OnlineReconnector
+
+class FakeOnline:
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    def connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('connection refused')
+
+        self.calls.append(('connect',))
+
+    def disconnect(self):
+        self.calls.append(('disconnect',))
+
+    def get_market_snapshot(self):
+        return {'bluechips': None}
+
+    def __getattr__(self, method):
+        return lambda *args: self.calls.append((method,) + args)
+
+def wait_reconnection(reconnector, reconnections=1, timeout=10):
+    deadline = time.monotonic() + timeout
+    while reconnector.get_metrics()['reconnections'] < reconnections:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+def test_subscriptions_are_replayed():
+    online = FakeOnline()
+    snapshots = []
+    reconnector = OnlineReconnector(online, on_snapshot=lambda online, snapshot: snapshots.append(snapshot), backoff=0.0)
+
+    reconnector.connect()
+    reconnector.subscribe_securities('bluechips', '48hs')
+    reconnector.subscribe_order_book('GGAL', '48hs')
+    reconnector.subscribe_personal_portfolio()
+    reconnector.subscribe_repos()
+    reconnector.unsubscribe_repos()
+    online.calls.clear()
+
+    reconnector.on_error(online, ConnectionError('lost'), True)
+    wait_reconnection(reconnector)
+
+    assert ('subscribe_securities', 'bluechips', '48hs') in online.calls
+    assert ('subscribe_order_book', 'GGAL', '48hs') in online.calls
+    assert ('subscribe_personal_portfolio',) in online.calls
+    assert ('subscribe_repos',) not in online.calls
+    assert snapshots == [{'bluechips': None}]
+
+def test_long_outage_does_not_stop_the_reconnection():
+    online = FakeOnline(failures=1100)
+    reconnector = OnlineReconnector(online, backoff=0.0)
+
+    reconnector.on_error(online, ConnectionError('lost'), True)
+    wait_reconnection(reconnector)
+
+    assert reconnector.get_metrics()['failed_attempts'] == 1100
+
+def test_retries_limit_the_attempts():
+    online = FakeOnline(failures=10)
+    reconnector = OnlineReconnector(online, retries=3, backoff=0.0)
+
+    reconnector.on_error(online, ConnectionError('lost'), True)
+    deadline = time.monotonic() + 10
+    while reconnector.get_metrics()['failed_attempts'] < 4:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert reconnector.get_metrics()['failed_attempts'] == 4
+    assert reconnector.get_metrics()['reconnections'] == 0
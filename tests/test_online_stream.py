@@ -0,0 +1,84 @@
+import time
+import asyncio
+import threading
+from online_stream import OnlineStream, OpenEvent, SecuritiesEvent, OrderBookEvent, CloseEvent
+
+async def consume(stream, *event_types):
+    return [event async for event in stream.stream(*event_types)]
+
+async def wait_consumers(stream, count):
+    while stream.get_metrics()['consumers'] < count:
+        await asyncio.sleep(0.01)
+
+def test_events_received_before_the_consumer_are_delivered():
+    stream = OnlineStream()
+    stream.on_open(None)
+    stream.on_securities(None, 'quotes')
+    stream.on_close(None)
+
+    events = asyncio.run(consume(stream))
+
+    assert [type(event) for event in events] == [OpenEvent, SecuritiesEvent, CloseEvent]
+
+def test_filtered_consumers_receive_their_events():
+    stream = OnlineStream()
+
+    async def main():
+        securities = asyncio.ensure_future(consume(stream, SecuritiesEvent))
+        order_books = asyncio.ensure_future(consume(stream, OrderBookEvent))
+        await wait_consumers(stream, 2)
+
+        def produce():
+            for i in range(10):
+                stream.on_securities(None, i)
+                stream.on_order_book(None, i)
+            stream.on_close(None)
+
+        threading.Thread(target=produce).start()
+        return await securities, await order_books
+
+    securities, order_books = asyncio.run(main())
+
+    assert [event.quotes for event in securities] == list(range(10))
+    assert all(isinstance(event, SecuritiesEvent) for event in securities)
+    assert [event.quotes for event in order_books] == list(range(10))
+    assert all(isinstance(event, OrderBookEvent) for event in order_books)
+
+def test_no_consumer_never_blocks_the_signalr_thread():
+    stream = OnlineStream(max_pending=3, timeout=5)
+
+    start = time.monotonic()
+    for i in range(10):
+        stream.on_securities(None, i)
+
+    assert time.monotonic() - start < 1
+    assert stream.get_metrics()['dropped'] == 7
+
+def test_full_consumer_queue_drops_after_the_timeout():
+    stream = OnlineStream(max_pending=2, timeout=0.05)
+
+    async def main():
+        iterator = stream.stream()
+        stream.on_securities(None, 0)
+        first = await iterator.__anext__()
+
+        produced = threading.Event()
+
+        def produce():
+            for i in range(1, 6):
+                stream.on_securities(None, i)
+            produced.set()
+
+        threading.Thread(target=produce).start()
+        while not produced.is_set():
+            await asyncio.sleep(0.01)
+
+        stream.on_close(None)
+        rest = [event async for event in iterator]
+        return [first] + rest
+
+    events = asyncio.run(main())
+
+    assert [event.quotes for event in events if isinstance(event, SecuritiesEvent)] == [0, 1, 2]
+    assert isinstance(events[-1], CloseEvent)
+    assert stream.get_metrics()['dropped'] == 3
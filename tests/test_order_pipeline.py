@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import types
+import importlib
+import threading
+import requests
+import pytest
+
+def import_package_module(name):
+    # order_pipeline uses relative imports, so it is loaded from a package without running the package __init__
+    if 'pyhomebroker' not in sys.modules:
+        package = types.ModuleType('pyhomebroker')
+        package.__path__ = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+        sys.modules['pyhomebroker'] = package
+
+    return importlib.import_module('pyhomebroker.' + name)
+
+order_pipeline = import_package_module('order_pipeline')
+
+class FakeOrders:
+
+    def __init__(self, errors=(), delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_buy_order(self, symbol, settlement, price, size):
+        time.sleep(self.delay)
+        with self.lock:
+            if self.errors:
+                raise self.errors.pop(0)
+
+            self.sent.append((symbol, settlement, price, size))
+            return len(self.sent)
+
+    send_sell_order = send_buy_order
+
+def make_request(key=None, side='buy'):
+    return order_pipeline.OrderRequest(side, 'GGAL', '48hs', 100.0, 1, key)
+
+def test_duplicate_keys_are_sent_once():
+    orders = FakeOrders(delay=0.05)
+    pipeline = order_pipeline.OrderPipeline(orders)
+
+    results = pipeline.submit_all([make_request('a'), make_request('a'), make_request('b')])
+
+    assert len(orders.sent) == 2
+    assert [result.status for result in results].count('duplicate') == 1
+    assert results[0].order_number == results[1].order_number
+    assert pipeline.submit_all([make_request('a')])[0].status == 'duplicate'
+
+def test_connect_timeouts_are_retried():
+    orders = FakeOrders(errors=[requests.exceptions.ConnectTimeout('timeout')])
+    pipeline = order_pipeline.OrderPipeline(orders, retries=2, backoff=0.0)
+
+    result = pipeline.submit_all([make_request()])[0]
+
+    assert result.status == 'sent'
+    assert len(orders.sent) == 1
+
+def test_errors_after_sending_are_not_retried():
+    orders = FakeOrders(errors=[requests.exceptions.ConnectionError('reset'), requests.exceptions.ReadTimeout('read')])
+    pipeline = order_pipeline.OrderPipeline(orders, retries=2, backoff=0.0)
+
+    result = pipeline.submit_all([make_request()])[0]
+
+    assert result.status == 'failed'
+    assert isinstance(result.error, requests.exceptions.ConnectionError)
+    assert orders.errors and not orders.sent
+
+def test_invalid_side_is_rejected():
+    with pytest.raises(ValueError):
+        order_pipeline.OrderPipeline(FakeOrders()).submit_all([make_request(side='short')])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from quote_table import QuoteTable
+
+def make_quotes(symbol, last, datetime='2025-01-17 11:00:00', **columns):
+    return pd.DataFrame(dict({'symbol': [symbol], 'settlement': ['48hs'], 'last': [last], 'datetime': [pd.Timestamp(datetime)]}, **columns)).set_index(['symbol', 'settlement'])
+
+def test_datetime_columns_round_trip():
+    table = QuoteTable(capacity=1)
+    table.update(make_quotes('GGAL', 100.0), 'securities')
+    table.update(make_quotes('GGAL25C', 5.0, expiration=[pd.Timestamp('2025-02-21')]), 'options')
+
+    snapshot = table.snapshot()
+    df = snapshot.to_frame()
+
+    assert df['datetime'].dtype == 'datetime64[ns]'
+    assert df.loc[('GGAL', '48hs'), 'datetime'] == pd.Timestamp('2025-01-17 11:00:00')
+    assert df.loc[('GGAL25C', '48hs'), 'expiration'] == pd.Timestamp('2025-02-21')
+    assert pd.isna(df.loc[('GGAL', '48hs'), 'expiration'])
+    assert snapshot.get_quote('GGAL', '48hs')['datetime'] == np.datetime64('2025-01-17T11:00:00')
+
+def test_datetime_column_mixed_with_objects():
+    table = QuoteTable()
+    table.update(make_quotes('GGAL', 100.0), 'securities')
+    table.update(make_quotes('YPFD', 200.0, datetime=None).astype({'datetime': object}), 'securities')
+
+    df = table.snapshot().to_frame()
+
+    assert df.loc[('GGAL', '48hs'), 'datetime'] == pd.Timestamp('2025-01-17 11:00:00')
+
+def test_snapshots_are_not_changed_by_updates():
+    table = QuoteTable()
+    table.update(make_quotes('GGAL', 100.0), 'securities')
+    snapshot = table.snapshot()
+    table.update(make_quotes('GGAL', 101.0), 'securities')
+
+    assert snapshot.get_quote('GGAL', '48hs')['last'] == 100.0
+    assert table.snapshot().get_quote('GGAL', '48hs')['last'] == 101.0
+    assert table.snapshot().version == snapshot.version + 1
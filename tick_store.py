@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Home Broker API - Market data downloader
+# https://github.com/crapher/pyhomebroker.git
+#
+# Copyright 2020 Diego Degese
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import json
+import datetime
+import numpy as np
+import pandas as pd
+
+class TickStore:
+
+    __securities_columns = ['symbol', 'settlement', 'bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations', 'datetime', 'group']
+    __numeric_columns = ['bid_size', 'bid', 'ask', 'ask_size', 'last', 'change', 'open', 'high', 'low', 'previous_close', 'turnover', 'volume', 'operations']
+    __stored_columns = {'timestamp': np.int64, 'symbol': np.int32, 'datetime': np.int64}
+    __stored_columns.update({column: np.float64 for column in __numeric_columns})
+
+    __symbols_file = 'symbols.json'
+    __unknown_board = 'unknown'
+    __date_format = '%Y%m%d'
+
+    def __init__(self, folder):
+        """
+        Class constructor.
+
+        Parameters
+        ----------
+        folder : str
+            Root folder of the store.  Snapshots are saved under folder/YYYYMMDD/board/settlement,
+            one binary file per column plus the symbols dictionary of the partition.
+        """
+
+        self.__folder = folder
+        self.__symbols = {}
+
+    def append(self, df, board=None, timestamp=None):
+        """
+        Append a board snapshot to the store.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Snapshot with the securities columns (symbol and settlement can be in the index).
+        board : str, optional
+            Board name used for the partition.  When it is not specified, the group column is used.  The rows
+            without board are saved under the 'unknown' board.
+        timestamp : datetime.datetime, optional
+            Time when the snapshot was taken.  Default: now.
+
+        Returns
+        -------
+        int
+            Number of rows stored.
+        """
+
+        timestamp = pd.Timestamp(timestamp or datetime.datetime.now())
+
+        if df.empty:
+            return 0
+
+        if 'symbol' not in df.columns:
+            df = df.reset_index()
+
+        if board is None and 'group' not in df.columns:
+            raise ValueError('The board must be specified when the snapshot has no group column.')
+
+        boards = pd.Series(board, index=df.index) if board is not None else df['group']
+        boards = boards.fillna('').replace('', self.__unknown_board)
+        partition_date = timestamp.strftime(self.__date_format)
+
+        for (board_name, settlement), partition in df.groupby([boards, df['settlement']], sort=False):
+            self.__append_partition(partition_date, board_name, settlement, partition, timestamp)
+
+        return len(df)
+
+    def append_snapshot(self, snapshot, timestamp=None):
+        """
+        Append all the boards of a market snapshot to the store.
+
+        Parameters
+        ----------
+        snapshot : dict
+            Dictionary with the board name as key and the board DataFrame as value (as returned by get_market_snapshot).
+        timestamp : datetime.datetime, optional
+            Time when the snapshot was taken.  Default: now.
+
+        Returns
+        -------
+        int
+            Number of rows stored.
+        """
+
+        timestamp = timestamp or datetime.datetime.now()
+
+        rows = 0
+        for board, df in snapshot.items():
+            if df is not None and 'bid' in df.columns:
+                rows += self.append(df, board=board, timestamp=timestamp)
+
+        return rows
+
+    def get_partitions(self, date=None):
+        """
+        Return the partitions available in the store.
+
+        Parameters
+        ----------
+        date : datetime.date or str, optional
+            Return only the partitions of this date.
+
+        Returns
+        -------
+        list of tuple
+            List of (date, board, settlement) tuples.
+        """
+
+        dates = [self.__format_date(date)] if date is not None else sorted(self.__list_folder(self.__folder))
+
+        partitions = []
+        for partition_date in dates:
+            date_folder = os.path.join(self.__folder, partition_date)
+            for board in sorted(self.__list_folder(date_folder)):
+                for settlement in sorted(self.__list_folder(os.path.join(date_folder, board))):
+                    partitions.append((partition_date, board, settlement))
+
+        return partitions
+
+    def read(self, date, board, settlement, symbols=None, start=None, end=None, as_frame=True):
+        """
+        Read a partition from the store.
+
+        The column files are memory-mapped and the time range is located with a binary search over the
+        snapshot timestamps (snapshots are appended in chronological order), so only the rows inside the
+        requested range are read from disk.
+
+        Parameters
+        ----------
+        date : datetime.date or str
+            Date of the partition (YYYYMMDD when it is a string).
+        board : str
+            Board of the partition (bluechips, general_board, cedears, government_bonds, short_term_government_bonds, corporate_bonds).
+        settlement : str
+            Settlement of the partition (spot, 24hs, 48hs).
+        symbols : list of str, optional
+            Return only these symbols.
+        start : datetime.datetime, optional
+            Return only the snapshots taken at or after this time.
+        end : datetime.datetime, optional
+            Return only the snapshots taken before this time.
+        as_frame : bool, optional
+            When False, a dictionary of NumPy arrays is returned instead of a DataFrame.  Default: True.
+        """
+
+        partition_folder = os.path.join(self.__folder, self.__format_date(date), board, settlement)
+        columns = self.__open_partition(partition_folder)
+
+        timestamps = columns['timestamp']
+        first = np.searchsorted(timestamps, pd.Timestamp(start).value, side='left') if start is not None else 0
+        last = np.searchsorted(timestamps, pd.Timestamp(end).value, side='left') if end is not None else len(timestamps)
+        columns = {column: values[first:last] for column, values in columns.items()}
+
+        symbols_list = self.__load_symbols(partition_folder, reload=True)
+        if symbols is not None:
+            symbols_index = {symbol: code for code, symbol in enumerate(symbols_list)}
+            codes = [symbols_index[symbol] for symbol in symbols if symbol in symbols_index]
+            mask = np.isin(columns['symbol'], codes)
+            columns = {column: values[mask] for column, values in columns.items()}
+
+        result = {
+            'timestamp': np.asarray(columns['timestamp']).view('datetime64[ns]'),
+            'symbol': np.array(symbols_list, dtype=object)[columns['symbol']] if symbols_list else np.empty(0, dtype=object),
+            'settlement': np.full(len(columns['timestamp']), settlement, dtype=object)}
+        result.update({column: np.asarray(columns[column]) for column in self.__numeric_columns})
+        result['datetime'] = np.asarray(columns['datetime']).view('datetime64[ns]')
+        result['group'] = np.full(len(columns['timestamp']), board, dtype=object)
+
+        if not as_frame:
+            return result
+
+        return pd.DataFrame(result, columns=['timestamp'] + self.__securities_columns)
+
+    #########################
+    #### PRIVATE METHODS ####
+    #########################
+    def __append_partition(self, partition_date, board, settlement, df, timestamp):
+
+        partition_folder = os.path.join(self.__folder, partition_date, board, settlement)
+        os.makedirs(partition_folder, exist_ok=True)
+
+        symbols = self.__load_symbols(partition_folder)
+        symbols_index = {symbol: code for code, symbol in enumerate(symbols)}
+        new_symbols = [symbol for symbol in pd.unique(df['symbol']) if symbol not in symbols_index]
+        if new_symbols:
+            for symbol in new_symbols:
+                symbols_index[symbol] = len(symbols)
+                symbols.append(symbol)
+            self.__save_symbols(partition_folder, symbols)
+
+        values = {
+            'timestamp': np.full(len(df), timestamp.value, dtype=np.int64),
+            'symbol': df['symbol'].map(symbols_index).to_numpy(dtype=np.int32),
+            'datetime': pd.to_datetime(df['datetime'], errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)}
+        for column in self.__numeric_columns:
+            values[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64) if column in df.columns else np.full(len(df), np.nan)
+
+        # Columns are appended one after the other, so a write interrupted in the middle leaves some
+        # columns longer than the others.  They are truncated to the common rows before appending.
+        self.__truncate_partition(partition_folder)
+
+        for column, dtype in self.__stored_columns.items():
+            with open(os.path.join(partition_folder, column + '.bin'), 'ab') as f:
+                f.write(values[column].astype(dtype, copy=False).tobytes())
+
+    def __truncate_partition(self, partition_folder):
+
+        sizes = {}
+        for column, dtype in self.__stored_columns.items():
+            filename = os.path.join(partition_folder, column + '.bin')
+            sizes[column] = os.path.getsize(filename) if os.path.exists(filename) else 0
+
+        rows = min(sizes[column] // np.dtype(dtype).itemsize for column, dtype in self.__stored_columns.items())
+        for column, dtype in self.__stored_columns.items():
+            size = rows * np.dtype(dtype).itemsize
+            if sizes[column] > size:
+                os.truncate(os.path.join(partition_folder, column + '.bin'), size)
+
+    def __open_partition(self, partition_folder):
+
+        columns = {}
+        for column, dtype in self.__stored_columns.items():
+            filename = os.path.join(partition_folder, column + '.bin')
+            size = os.path.getsize(filename) // np.dtype(dtype).itemsize if os.path.exists(filename) else 0
+            columns[column] = np.memmap(filename, dtype=dtype, mode='r', shape=(size,)) if size else np.empty(0, dtype=dtype)
+
+        rows = min(len(values) for values in columns.values())
+        return {column: values[:rows] for column, values in columns.items()}
+
+    def __load_symbols(self, partition_folder, reload=False):
+
+        if reload or partition_folder not in self.__symbols:
+            filename = os.path.join(partition_folder, self.__symbols_file)
+            if os.path.exists(filename):
+                with open(filename, 'r') as f:
+                    self.__symbols[partition_folder] = json.load(f)
+            else:
+                self.__symbols[partition_folder] = []
+
+        return self.__symbols[partition_folder]
+
+    def __save_symbols(self, partition_folder, symbols):
+
+        filename = os.path.join(partition_folder, self.__symbols_file)
+        with open(filename + '.tmp', 'w') as f:
+            json.dump(symbols, f)
+
+        os.replace(filename + '.tmp', filename)
+
+    def __format_date(self, date):
+
+        return date if isinstance(date, str) else date.strftime(self.__date_format)
+
+    def __list_folder(self, folder):
+
+        return [name for name in os.listdir(folder) if os.path.isdir(os.path.join(folder, name))] if os.path.isdir(folder) else []